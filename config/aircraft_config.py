@@ -1,22 +1,40 @@
-from typing import List, Dict
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from typing import Annotated, List, Dict
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import VERSION as PYDANTIC_VERSION, BaseModel, ConfigDict, Field, field_validator
 
 from config.settings import settings
 
+logger = logging.getLogger("uvicorn")
+
+# Версия снимка конфигурации: хэш исходного кода этого модуля и версия pydantic.
+# Снимок, собранный другими определениями моделей (Seat, Aircraft, ...) или другой
+# версией pydantic, не загружается
+with open(__file__, "rb") as _source:
+    _CACHE_VERSION = (hashlib.sha256(_source.read()).hexdigest(), PYDANTIC_VERSION)
+
 class SeatClass(str, Enum):
     FIRST = "first"
     BUSINESS = "business"
     PREMIUM_ECONOMY = "premium_economy"
     ECONOMY = "economy"
 
-class Seat(BaseModel):
-    """Модель места в самолете"""
-    seat_number: str = Field(..., alias="seatNumber")
-    seat_class: SeatClass = Field(..., alias="seatClass")
+@dataclass(slots=True, frozen=True)
+class Seat:
+    """Модель места в самолете (неизменяемый dataclass со слотами, без __dict__)"""
+    seat_number: Annotated[str, Field(alias="seatNumber")]
+    seat_class: Annotated[SeatClass, Field(alias="seatClass")]
 
 class Aircraft(BaseModel):
     """Модель самолета"""
+    model_config = ConfigDict(defer_build=True)
+
     model: str
     baggage_capacity_kg: int = Field(..., alias="baggageCapacityKg")
     passenger_capacity: int = Field(..., alias="passengerCapacity")
@@ -26,20 +44,103 @@ class Aircraft(BaseModel):
 
 class AircraftConfig(BaseModel):
     """Корневая модель конфигурации самолетов"""
+    model_config = ConfigDict(defer_build=True)
+
     aircraft: Dict[str, Aircraft]
 
+    @field_validator("aircraft", mode="before")
+    @classmethod
+    def _normalize_aircraft(cls, value):
+        """Преобразует старый формат (список) в новый (словарь по модели)"""
+        if type(value) is list:
+            return {item["model"]: item for item in value}
+        return value
+
+    @classmethod
+    def from_config(cls, config_path: str, validate: bool = False) -> "AircraftConfig":
+        """
+        Загрузка конфигурации из JSON файла
+        
+        Args:
+            config_path: Путь к файлу конфигурации
+            validate: Выполнять полную валидацию pydantic (для CI/отладки).
+                По умолчанию файл считается доверенным и модели собираются
+                через model_construct без валидации
+        """
+        if validate:
+            # Разбор и валидация JSON целиком выполняются в pydantic-core
+            with open(config_path, "rb") as f:
+                return cls.model_validate_json(f.read())
+
+        # Снимок уже разобранной конфигурации, привязанный к содержимому исходного
+        # файла и к версии снимка. Хэширование файла намного дешевле разбора JSON
+        with open(config_path, "rb") as f:
+            raw = f.read()
+        cache_key = (_CACHE_VERSION, hashlib.sha256(raw).hexdigest())
+        cache_path = os.path.splitext(config_path)[0] + ".cache.pkl"
+        try:
+            with open(cache_path, "rb") as f:
+                key, config = pickle.load(f)
+            if key == cache_key and isinstance(config, cls):
+                return config
+            logger.debug("Снимок конфигурации %s устарел, конфигурация разбирается заново", cache_path)
+        except FileNotFoundError:
+            pass
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError) as e:
+            # Поврежденный или несовместимый снимок просто собирается заново
+            logger.debug("Снимок конфигурации %s не загружен (%s), конфигурация разбирается заново", cache_path, e)
+
+        config = cls._construct(json.loads(raw))
+
+        # Запись через временный файл и os.replace: воркеры, стартующие одновременно,
+        # не видят частично записанный снимок
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or ".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump((cache_key, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            # Каталог конфигурации может быть доступен только для чтения
+            pass
+
+        return config
+
     @classmethod
-    def from_config(cls, config_path: str) -> "AircraftConfig":
-        """Загрузка конфигурации из JSON файла"""
-        import json
-        with open(config_path, "r") as f:
-            data = json.load(f)
-            
-        # Если в данных старый формат (список), преобразуем его в новый (словарь)
-        if isinstance(data.get("aircraft"), list):
-            aircraft_list = data["aircraft"]
-            data["aircraft"] = {item["model"]: item for item in aircraft_list}
-            
-        return cls.model_validate(data)
+    def _construct(cls, data: dict) -> "AircraftConfig":
+        """Сборка моделей из доверенных данных без валидации"""
+        aircraft_data = data["aircraft"]
+        # Старый формат (список) поддерживается наравне с новым (словарь):
+        # ключи берутся по ходу сборки, без отдельного прохода для преобразования
+        if type(aircraft_data) is list:
+            items = ((item["model"], item) for item in aircraft_data)
+        else:
+            items = aircraft_data.items()
+
+        aircraft = {}
+        for key, item in items:
+            seats = [
+                Seat(
+                    seat_number=seat["seatNumber"],
+                    seat_class=SeatClass(seat["seatClass"]),
+                )
+                for seat in item["seats"]
+            ]
+            aircraft[key] = Aircraft.model_construct(
+                model=item["model"],
+                baggage_capacity_kg=item["baggageCapacityKg"],
+                passenger_capacity=item["passengerCapacity"],
+                water_capacity=item["waterCapacity"],
+                fuel_capacity=item["fuelCapacity"],
+                seats=seats,
+            )
+
+        return cls.model_construct(aircraft=aircraft)
     
-aircraft_config = AircraftConfig.from_config(settings.AIRCRAFT_CONFIG_PATH)
+aircraft_config = AircraftConfig.from_config(
+    settings.AIRCRAFT_CONFIG_PATH,
+    validate=settings.AIRCRAFT_CONFIG_VALIDATE,
+)
@@ -1,8 +1,33 @@
-from pydantic_settings import BaseSettings
+import os
+from functools import lru_cache
+from typing import Any, Dict
+
+from dotenv import dotenv_values
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        defer_build=True,
+    )
+    
     AIRCRAFT_CONFIG_PATH: str = "config/aircraft_config.json"
+    # Полная валидация конфигурации самолетов при загрузке (для CI)
+    AIRCRAFT_CONFIG_VALIDATE: bool = False
     REDIS_URL: str = "redis://localhost:6379"
+    REDIS_MAX_CONNECTIONS: int = 64
+    # Количество соединений, открываемых при запуске приложения
+    REDIS_PREWARM_CONNECTIONS: int = 10
+    # Ограничение (сек) на прогрев пула, чтобы недоступный Redis не задерживал запуск
+    REDIS_PREWARM_TIMEOUT: int = 3
+    # Ограничение (сек) на установку соединения с Redis
+    REDIS_CONNECT_TIMEOUT: int = 5
+    # Интервал (сек) проверки простаивающих соединений перед использованием
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    # Уровень логгера uvicorn (например, WARNING в продакшене); пусто - не меняется
+    LOG_LEVEL: str = ""
     
     # Настройки для внешнего сервиса Example Service
     ORCHESTRATOR_SERVICE_URL: str = "http://orchestrator-service-api.com"
@@ -12,10 +37,42 @@ class Settings(BaseSettings):
     GROUND_CONTROL_SERVICE_URL: str = "http://ground-control-service-api.com"
     GROUND_CONTROL_SERVICE_TIMEOUT: int = 30
     GROUND_CONTROL_SERVICE_MAX_RETRIES: int = 5
+
+@lru_cache(maxsize=1)
+def _load_env_dict() -> Dict[str, str]:
+    """Значения из .env, прочитанные один раз на процесс"""
+    values = dotenv_values(
+        Settings.model_config["env_file"],
+        encoding=Settings.model_config["env_file_encoding"],
+    )
+    return {key: value for key, value in values.items() if value is not None}
+
+def _coerce(annotation: Any, value: str) -> Any:
+    """Приведение строкового значения из окружения к типу поля настроек"""
+    if annotation is bool:
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if annotation is int:
+        return int(value)
+    return value
+
+def load_settings() -> Settings:
+    """
+    Загрузка настроек приложения.
+    
+    По умолчанию значения из .env и окружения считаются доверенными и
+    настройки собираются через model_construct без валидации pydantic.
+    Полная валидация включается переменной окружения SETTINGS_VALIDATE=1 (для CI).
+    """
+    if os.environ.get("SETTINGS_VALIDATE") == "1":
+        return Settings()
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
+    # Переменные окружения имеют приоритет над .env, как и в BaseSettings
+    source = {**_load_env_dict(), **os.environ}
+    values = {
+        name: _coerce(field.annotation, source[name])
+        for name, field in Settings.model_fields.items()
+        if name in source
+    }
+    return Settings.model_construct(**values)
 
-settings = Settings()
+settings = load_settings()
@@ -1,33 +1,82 @@
+import asyncio
+import logging
 import redis.asyncio as redis
-from typing import AsyncGenerator, Optional
+from typing import Optional
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
 from config.settings import settings
 
+logger = logging.getLogger("uvicorn")
+
 # Хранилище для клиента Redis
 class RedisStore:
     client: Optional[redis.Redis] = None
+    pool: Optional[redis.ConnectionPool] = None
+    # Защищает от параллельного создания нескольких пулов
+    _init_lock = asyncio.Lock()
     
     @classmethod
     async def init_redis(cls):
-        """Инициализация клиента Redis при запуске приложения"""
-        cls.client = redis.from_url(
-            settings.REDIS_URL,
-            decode_responses=True
-        )
+        """Инициализация клиента Redis с ограниченным пулом соединений при запуске приложения"""
+        async with cls._init_lock:
+            if cls.client is not None:
+                return
+            cls.pool = redis.ConnectionPool.from_url(
+                settings.REDIS_URL,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                decode_responses=True,
+                socket_keepalive=True,
+                # Недоступный Redis не держит запрос (и запуск) до системного таймаута TCP
+                socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+                # Простаивающие соединения проверяются PING перед использованием,
+                # чтобы запрос не получал разорванное соединение из пула
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+            )
+            cls.client = redis.Redis(connection_pool=cls.pool)
+            await cls._prewarm()
+    
+    @classmethod
+    async def _prewarm(cls):
+        """
+        Открывает соединения пула заранее, чтобы первые запросы после запуска
+        не тратили время на установку соединения с Redis
+        """
+        count = min(settings.REDIS_PREWARM_CONNECTIONS, settings.REDIS_MAX_CONNECTIONS)
+        if count <= 0:
+            return
+        connections = []
+        
+        async def acquire():
+            # Соединения удерживаются до конца прогрева, чтобы пул открыл новое на каждой итерации
+            for _ in range(count):
+                connections.append(await cls.pool.get_connection())
+        
+        try:
+            await asyncio.wait_for(acquire(), settings.REDIS_PREWARM_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Прогрев пула соединений Redis не завершился за %s с, открыто соединений: %s", settings.REDIS_PREWARM_TIMEOUT, len(connections))
+        except Exception as e:
+            # Прогрев только ускоряет первые запросы: при любой ошибке соединения откроются по запросу
+            logger.warning("Не удалось прогреть пул соединений Redis: %s", e)
+        finally:
+            for connection in connections:
+                await cls.pool.release(connection)
         
     @classmethod
     async def close_redis(cls):
-        """Закрытие клиента Redis при остановке приложения"""
+        """Закрытие клиента и пула соединений Redis при остановке приложения"""
         if cls.client:
-            await cls.client.close()
+            await cls.client.aclose()
             cls.client = None
+        if cls.pool:
+            await cls.pool.disconnect()
+            cls.pool = None
 
 # Функция для получения клиента Redis в зависимостях
-async def get_redis_client() -> AsyncGenerator[redis.Redis, None]:
+async def get_redis_client() -> redis.Redis:
     """
-    Асинхронный генератор для предоставления экземпляра Redis-клиента.
+    Возвращает общий экземпляр Redis-клиента.
     Используется как зависимость FastAPI.
     
     Пример использования:
@@ -43,7 +92,7 @@ async def get_redis_client() -> AsyncGenerator[redis.Redis, None]:
         
     # Предоставляем клиента вызывающему коду
     assert RedisStore.client is not None
-    yield RedisStore.client
+    return RedisStore.client
 
 # Асинхронный контекстный менеджер для управления жизненным циклом Redis
 @asynccontextmanager
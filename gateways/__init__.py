@@ -0,0 +1,29 @@
+from functools import lru_cache
+from typing import Annotated
+from fastapi import Depends
+
+from gateways.ground_control import GroundControlGateway
+from gateways.orch import OrchestratorGateway
+
+@lru_cache(maxsize=1)
+def get_ground_control() -> GroundControlGateway:
+    """
+    Возвращает общий на процесс экземпляр шлюза ground control.
+    Используется как зависимость в FastAPI.
+    
+    Шлюз не хранит состояния запроса, а HTTP-сессия с пулом соединений
+    общая для всех шлюзов и закрывается в global_lifespan.
+    """
+    return GroundControlGateway()
+
+@lru_cache(maxsize=1)
+def get_orchestrator() -> OrchestratorGateway:
+    """
+    Возвращает общий на процесс экземпляр шлюза оркестратора.
+    Используется как зависимость в FastAPI.
+    """
+    return OrchestratorGateway()
+
+# Аннотированные зависимости для удобного использования
+GroundControlDep = Annotated[GroundControlGateway, Depends(get_ground_control)]
+OrchestratorDep = Annotated[OrchestratorGateway, Depends(get_orchestrator)]
@@ -1,21 +1,53 @@
 import asyncio
 import logging
-import json
 import time
 from typing import Dict, Any, Optional, Union, List
-from urllib.parse import urljoin
 
 import aiohttp
+import orjson
 from aiohttp.client_exceptions import ClientError
+from yarl import URL
 
 logger = logging.getLogger("uvicorn")
 
+# Ключи тела запроса, значения которых маскируются в логах
+_SENSITIVE_KEYS = frozenset({'password', 'token', 'secret', 'key', 'auth'})
+
+def _redact(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Возвращает данные для логирования с замаскированными чувствительными значениями.
+    Если чувствительных ключей нет, возвращает исходный словарь без копирования.
+    """
+    if _SENSITIVE_KEYS.isdisjoint(data):
+        return data
+    return {k: ('***' if k in _SENSITIVE_KEYS else v) for k, v in data.items()}
+
+def _json_serialize(obj: Any) -> str:
+    """Сериализация тела запроса для aiohttp через orjson"""
+    return orjson.dumps(obj).decode()
+
+class GatewayHTTPError(Exception):
+    """Ошибочный HTTP-статус в ответе внешнего сервиса"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class RetryableHTTPError(GatewayHTTPError):
+    """Ошибка, после которой запрос повторяется (5xx, 429)"""
+
+class NonRetryableHTTPError(GatewayHTTPError):
+    """Клиентская ошибка (4xx, кроме 429), запрос не повторяется"""
+
 class BaseGateway:
     """
     Базовый класс для выполнения HTTP-запросов к внешним сервисам
     с механизмом бесконечных ретраев при ошибках.
     """
     
+    # Общая HTTP-сессия с пулом соединений для всех шлюзов
+    _session: Optional[aiohttp.ClientSession] = None
+    
     def __init__(
         self,
         base_url: str,
@@ -39,6 +71,8 @@ class BaseGateway:
             headers: Дополнительные заголовки для запросов
         """
         self.base_url = base_url.rstrip('/')
+        # Базовый URL разбирается один раз; aiohttp принимает yarl.URL без повторного разбора
+        self._base_url = URL(self.base_url)
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
@@ -48,6 +82,39 @@ class BaseGateway:
         
         if 'Content-Type' not in self.headers:
             self.headers['Content-Type'] = 'application/json'
+        
+        # Последовательность задержек между попытками постоянна для шлюза,
+        # поэтому вычисляем ее один раз. Последнее значение используется
+        # для всех последующих попыток (при бесконечных ретраях)
+        delays = [retry_delay]
+        while (
+            (max_retries == 0 or len(delays) < max_retries)
+            and 0 < delays[-1] < max_retry_delay
+            and retry_multiplier > 1
+        ):
+            delays.append(min(delays[-1] * retry_multiplier, max_retry_delay))
+        self._delays: tuple[float, ...] = tuple(delays)
+    
+    @classmethod
+    async def _ensure_session(cls) -> aiohttp.ClientSession:
+        """Возвращает общую HTTP-сессию, создавая ее при первом обращении"""
+        if BaseGateway._session is None or BaseGateway._session.closed:
+            BaseGateway._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60,
+                ),
+                json_serialize=_json_serialize,
+            )
+        return BaseGateway._session
+    
+    @classmethod
+    async def aclose(cls) -> None:
+        """Закрытие общей HTTP-сессии при остановке приложения"""
+        if BaseGateway._session is not None:
+            await BaseGateway._session.close()
+            BaseGateway._session = None
     
     async def _make_request(
         self,
@@ -75,9 +142,14 @@ class BaseGateway:
             Any: Ответ сервера, обычно в виде словаря или списка
             
         Raises:
+            NonRetryableHTTPError: При клиентской ошибке (4xx, кроме 429), без повторов
             Exception: При ошибке после всех повторных попыток
         """
-        url = urljoin(f"{self.base_url}/", endpoint.lstrip('/'))
+        if endpoint[:4] == 'http':
+            # Абсолютный URL используем как есть
+            url = URL(endpoint)
+        else:
+            url = self._base_url / endpoint.lstrip('/')
         request_headers = {**self.headers}
         if headers:
             request_headers.update(headers)
@@ -91,101 +163,97 @@ class BaseGateway:
                 json_data = data
                 data = None
         
-        # Логируем информацию о запросе
-        log_data = {
-            "method": method,
-            "url": url,
-            "params": params,
-        }
-        
-        # Логируем данные запроса, исключая чувствительную информацию
-        if json_data:
-            # Создаем копию для логирования, чтобы не изменять оригинальные данные
-            log_json_data = json_data
-            if isinstance(log_json_data, dict):
-                # Если это словарь, то делаем копию
-                log_json_data = log_json_data.copy()
-                # Маскируем чувствительные данные при их наличии
-                for key in ['password', 'token', 'secret', 'key', 'auth']:
-                    if key in log_json_data:
-                        log_json_data[key] = '***'
-            log_data["data"] = log_json_data
-        
-        logger.info(f"Отправка запроса: {json.dumps(log_data, ensure_ascii=False)}")
+        # Логируем информацию о запросе только если уровень INFO включен,
+        # чтобы не сериализовать данные впустую
+        if logger.isEnabledFor(logging.INFO):
+            log_data = {
+                "method": method,
+                "url": str(url),
+                "params": params,
+            }
+            
+            # Логируем данные запроса, исключая чувствительную информацию
+            if json_data:
+                log_data["data"] = _redact(json_data) if isinstance(json_data, dict) else json_data
+            
+            logger.info("Отправка запроса: %s", orjson.dumps(log_data).decode())
         
         retries = 0
-        current_delay = self.retry_delay
+        last_delay_index = len(self._delays) - 1
         
         while self.max_retries == 0 or retries <= self.max_retries:
             try:
-                async with aiohttp.ClientSession() as session:
-                    logger.debug(f"Выполняю {method} запрос к {url}")
+                session = await self._ensure_session()
+                logger.debug("Выполняю %s запрос к %s", method, url)
+
+                async with session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    data=data,
+                    json=json_data,
+                    headers=request_headers,
+                    timeout=request_timeout,
+                    allow_redirects=allow_redirects,
+                ) as response:
+                    # Читаем ответ
+                    content = await response.read()
                     
-                    async with session.request(
-                        method=method,
-                        url=url,
-                        params=params,
-                        data=data,
-                        json=json_data,
-                        headers=request_headers,
-                        timeout=request_timeout,
-                        allow_redirects=allow_redirects,
-                    ) as response:
-                        # Читаем ответ
-                        content = await response.read()
-                        
-                        # Обрабатываем статус ответа
-                        if 200 <= response.status < 300:
-                            # Успешный ответ
-                            if not content:
-                                logger.info(f"Получен пустой ответ от {url}, status={response.status}")
-                                return None
-                                
-                            try:
-                                response_json = await response.json()
-                                # Логируем ответ сервера
-                                logger.info(f"Получен ответ от {url}, status={response.status}, data={json.dumps(response_json, ensure_ascii=False)}")
-                                return response_json
-                            except json.JSONDecodeError:
-                                # Если ответ не JSON, логируем как текст
-                                response_text = content.decode('utf-8')
-                                logger.info(f"Получен текстовый ответ от {url}, status={response.status}, data={response_text[:500]}")
-                                return response_text
-                        else:
-                            error_msg = f"Ошибка запроса {method} {url}: статус {response.status}"
-                            try:
-                                error_data = await response.json()
-                                error_msg += f", данные: {error_data}"
-                            except:
-                                if content:
-                                    error_msg += f", контент: {content.decode('utf-8', errors='replace')}"
-                            
-                            logger.error(error_msg)
-                            
-                            # Не повторяем запрос для клиентских ошибок (4xx)
-                            if 400 <= response.status < 500:
-                                # Для 429 (Too Many Requests) все же делаем ретрай
-                                if response.status != 429:
-                                    raise Exception(error_msg)
-                            
-                            # Сервер недоступен или ошибка - повторяем запрос
-                            raise Exception(error_msg)
+                    # Обрабатываем статус ответа
+                    if 200 <= response.status < 300:
+                        # Успешный ответ
+                        if not content:
+                            logger.info("Получен пустой ответ от %s, status=%s", url, response.status)
+                            return None
                             
-            except (ClientError, asyncio.TimeoutError, Exception) as e:
+                        # Тело уже прочитано: разбираем его один раз, а в лог
+                        # пишем исходные байты без повторной сериализации
+                        try:
+                            response_json = orjson.loads(content)
+                        except orjson.JSONDecodeError:
+                            # Если ответ не JSON, логируем как текст
+                            response_text = content.decode('utf-8')
+                            logger.info("Получен текстовый ответ от %s, status=%s, data=%s", url, response.status, response_text[:500])
+                            return response_text
+                        
+                        if logger.isEnabledFor(logging.INFO):
+                            logger.info("Получен ответ от %s, status=%s, data=%s", url, response.status, content[:500].decode('utf-8', errors='replace'))
+                        return response_json
+                    else:
+                        error_msg = f"Ошибка запроса {method} {url}: статус {response.status}"
+                        try:
+                            error_data = orjson.loads(content)
+                            error_msg += f", данные: {error_data}"
+                        except orjson.JSONDecodeError:
+                            if content:
+                                error_msg += f", контент: {content.decode('utf-8', errors='replace')}"
+                        
+                        logger.error(error_msg)
+                        
+                        # Не повторяем запрос для клиентских ошибок (4xx)
+                        if 400 <= response.status < 500:
+                            # Для 429 (Too Many Requests) все же делаем ретрай
+                            if response.status != 429:
+                                raise NonRetryableHTTPError(response.status, error_msg)
+                        
+                        # Сервер недоступен или ошибка - повторяем запрос
+                        raise RetryableHTTPError(response.status, error_msg)
+                        
+            # NonRetryableHTTPError сюда не попадает и сразу пробрасывается вызывающему коду
+            except (ClientError, asyncio.TimeoutError, RetryableHTTPError) as e:
                 retries += 1
                 
                 if self.max_retries > 0 and retries > self.max_retries:
-                    logger.error(f"Превышено максимальное количество попыток ({self.max_retries}) для {method} {url}. Последняя ошибка: {str(e)}")
+                    logger.error("Превышено максимальное количество попыток (%s) для %s %s. Последняя ошибка: %s", self.max_retries, method, url, e)
                     raise
                 
+                delay = self._delays[min(retries - 1, last_delay_index)]
+                
                 # Логируем информацию о повторе
-                logger.warning(f"Ошибка при выполнении {method} запроса к {url}: {str(e)}. Повторная попытка {retries} через {current_delay} сек.")
+                logger.warning("Ошибка при выполнении %s запроса к %s: %s. Повторная попытка %s через %s сек.", method, url, e, retries, delay)
                 
                 # Ждем перед следующей попыткой
-                await asyncio.sleep(current_delay)
-                
-                # Увеличиваем задержку для следующей попытки
-                current_delay = min(current_delay * self.retry_multiplier, self.max_retry_delay)
+                await asyncio.sleep(delay)
     
     async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
         """
@@ -1,4 +1,5 @@
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, List
 import logging
 
 from gateways.base import BaseGateway
@@ -38,15 +39,31 @@ class GroundControlGateway(BaseGateway):
                 - vehicleId: Назначенный ID транспортного средства
                 - serviceSpots: Доступные сервисные точки
         """
-        logger.info(f"Регистрация самолета в ground control")
+        logger.info("Регистрация самолета в ground control")
         
         try:
             # Отправляем пустой POST запрос на регистрацию самолета
             # Согласно формату API: POST /register-vehicle/airplane
             response = await self.post("register-vehicle/airplane", data={})
             
-            logger.info(f"Самолет успешно зарегистрирован в ground control с ID: {response.get('vehicleId', 'неизвестно')}")
+            logger.info("Самолет успешно зарегистрирован в ground control с ID: %s", response.get('vehicleId', 'неизвестно'))
             return response
         except Exception as e:
-            logger.error(f"Ошибка при регистрации самолета в ground control: {str(e)}")
+            logger.error("Ошибка при регистрации самолета в ground control: %s", e)
             raise
+    
+    async def register_vehicles_bulk(self, count: int) -> List[Dict[str, Any]]:
+        """
+        Регистрирует несколько самолетов в сервисе ground control конкурентно
+        
+        Запросы выполняются параллельно через общую HTTP-сессию шлюза,
+        поэтому суммарная задержка близка к задержке одного запроса.
+        
+        Args:
+            count: Количество регистрируемых самолетов
+                
+        Returns:
+            List[Dict[str, Any]]: Результаты регистрации в порядке запросов
+        """
+        logger.info("Пакетная регистрация %s самолетов в ground control", count)
+        return await asyncio.gather(*(self.register_vehicle() for _ in range(count)))
@@ -1,4 +1,5 @@
-from typing import Dict, Any, Optional
+import asyncio
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 
 from gateways.base import BaseGateway
@@ -36,15 +37,30 @@ class OrchestratorGateway(BaseGateway):
         Returns:
             Dict[str, Any]: Результат операции от сервиса оркестратора
         """
-        logger.info(f"Отправка сообщения о приземлении самолета {aircraft_id} в точке {landing_point}")
+        logger.info("Отправка сообщения о приземлении самолета %s в точке %s", aircraft_id, landing_point)
         
         try:
             # Отправляем POST запрос о приземлении
             data = {"landing_point": landing_point}
             response = await self.post(f"aircraft/{aircraft_id}/landing", data=data)
             
-            logger.info(f"Сообщение о приземлении самолета {aircraft_id} успешно отправлено в оркестратор")
+            logger.info("Сообщение о приземлении самолета %s успешно отправлено в оркестратор", aircraft_id)
             return response
         except Exception as e:
-            logger.error(f"Ошибка при отправке сообщения о приземлении самолета {aircraft_id}: {str(e)}")
+            logger.error("Ошибка при отправке сообщения о приземлении самолета %s: %s", aircraft_id, e)
             raise
+    
+    async def report_landings_bulk(self, landings: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Отправляет сообщения о приземлении нескольких самолетов конкурентно
+        
+        Args:
+            landings: Пары (ID самолета, точка приземления)
+                
+        Returns:
+            List[Dict[str, Any]]: Результаты операций в порядке входных данных
+        """
+        logger.info("Пакетная отправка %s сообщений о приземлении в оркестратор", len(landings))
+        return await asyncio.gather(
+            *(self.report_landing(aircraft_id, landing_point) for aircraft_id, landing_point in landings)
+        )
@@ -1,7 +1,9 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
-from db.redis import redis_lifespan
+from db.redis import get_redis_client, redis_lifespan
+from gateways.base import BaseGateway
+from services import get_aircraft_service
 
 @asynccontextmanager
 async def global_lifespan(app: FastAPI):
@@ -14,9 +16,17 @@ async def global_lifespan(app: FastAPI):
     """
     # Создаем несколько контекстных менеджеров
     async with redis_lifespan(app):
+        # Записи, сохраненные прежней раскладкой ключей Redis, переносятся до приема запросов
+        service = await get_aircraft_service(await get_redis_client())
+        await service.migrate_legacy_keys()
+        
         # Здесь можно добавить другие контекстные менеджеры
         # когда они появятся в приложении
         # async with other_component_lifespan(app):
         
-        # Передаем управление приложению
-        yield 
\ No newline at end of file
+        try:
+            # Передаем управление приложению
+            yield
+        finally:
+            # Закрываем общую HTTP-сессию шлюзов
+            await BaseGateway.aclose() 
\ No newline at end of file
@@ -1,8 +1,11 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 import logging
 from config.aircraft_config import aircraft_config
+from config.settings import settings
 from lifespan import global_lifespan
 from routers import aircraft
+from services.aircraft_service import AircraftNotFound, StorageError, ValidationFailed
 
 # Настройка логирования
 logging.basicConfig(
@@ -11,27 +14,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger("app")
 
+# Повышенный уровень отключает INFO-логи обработчиков до форматирования сообщений
+if settings.LOG_LEVEL:
+    logging.getLogger("uvicorn").setLevel(settings.LOG_LEVEL.upper())
+
 # Создаем экземпляр FastAPI с указанием глобального lifespan
 app = FastAPI(
     title="Aircraft API",
     description="API для работы с данными самолетов",
     version="1.0.0",
-    lifespan=global_lifespan
+    lifespan=global_lifespan,
 )
 
 # Регистрируем роутеры
 app.include_router(aircraft.router)
 
+# Ошибки сервиса самолетов преобразуются в HTTP-ответы в одном месте,
+# без try/except в каждом обработчике
+@app.exception_handler(AircraftNotFound)
+async def aircraft_not_found_handler(request: Request, exc: AircraftNotFound):
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+@app.exception_handler(ValidationFailed)
+async def validation_failed_handler(request: Request, exc: ValidationFailed):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+@app.exception_handler(StorageError)
+async def storage_error_handler(request: Request, exc: StorageError):
+    return JSONResponse(status_code=500, content={"detail": str(exc)})
+
+# Конфигурация моделей статична: список для корневого маршрута строится один раз
+_AVAILABLE_MODELS = tuple(aircraft_config.aircraft.keys())
+
 # Корневой маршрут
 @app.get("/")
 async def root():
     logger.info("Запрос к корневому маршруту")
     return {
         "message": "Aircraft API is running",
-        "available_models": list(aircraft_config.aircraft.keys())
+        "available_models": _AVAILABLE_MODELS
     }
 
 if __name__ == "__main__":
     import uvicorn
     logger.info("Запуск приложения Aircraft API")
+    # С uvicorn[standard] по умолчанию (loop="auto", http="auto") выбираются uvloop и httptools
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
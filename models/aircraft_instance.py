@@ -1,9 +1,26 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+
+
+# Поле фактического значения -> (поле вместимости, шаблон сообщения об ошибке)
+_BOUNDED_FIELDS = {
+    "actual_passengers": ("passenger_capacity", "Количество пассажиров ({value}) превышает вместимость ({capacity})"),
+    "actual_baggage_kg": ("baggage_capacity_kg", "Вес багажа ({value} кг) превышает вместимость ({capacity} кг)"),
+    "actual_water_kg": ("water_capacity", "Вес воды ({value} кг) превышает вместимость ({capacity} кг)"),
+    "actual_fuel_kg": ("fuel_capacity", "Вес топлива ({value} кг) превышает вместимость ({capacity} кг)"),
+}
 
 
 class AircraftInstance(BaseModel):
     """Модель инстанса самолета"""
+    model_config = ConfigDict(
+        defer_build=True,
+        extra="forbid",
+        validate_assignment=False,  # update_* сами проверяют границы значений
+        frozen=False,
+        populate_by_name=True,
+    )
+
     id: Optional[str] = None
     model: str  # Модель самолета, соответствующая ключу в конфигурации
     flight_id: Optional[str] = None  # Идентификатор рейса
@@ -20,29 +37,39 @@ class AircraftInstance(BaseModel):
     actual_water_kg: int = 0  # Фактический вес воды в кг
     actual_fuel_kg: int = 0  # Фактический вес топлива в кг
     
-    def update_passengers(self, count: int):
+    @staticmethod
+    def capacity_field(field: str) -> Optional[str]:
+        """Имя поля вместимости, ограничивающего значение field; None, если поле не ограничено"""
+        bounded = _BOUNDED_FIELDS.get(field)
+        return bounded[0] if bounded else None
+    
+    @staticmethod
+    def capacity_error(field: str, value: int, capacity: int) -> str:
+        """Сообщение об ошибке при превышении вместимости для поля field"""
+        return _BOUNDED_FIELDS[field][1].format(value=value, capacity=capacity)
+    
+    def _set_bounded(self, field: str, value: int) -> None:
+        """Устанавливает значение поля, проверяя его по вместимости из _BOUNDED_FIELDS"""
+        capacity = getattr(self, _BOUNDED_FIELDS[field][0])
+        if value > capacity:
+            raise ValueError(self.capacity_error(field, value, capacity))
+        setattr(self, field, value)
+    
+    def update_passengers(self, count: int) -> None:
         """Обновляет количество пассажиров"""
-        if count > self.passenger_capacity:
-            raise ValueError(f"Количество пассажиров ({count}) превышает вместимость ({self.passenger_capacity})")
-        self.actual_passengers = count
+        self._set_bounded("actual_passengers", count)
     
     def update_baggage(self, weight: int) -> None:
         """Обновляет вес багажа"""
-        if weight > self.baggage_capacity_kg:
-            raise ValueError(f"Вес багажа ({weight} кг) превышает вместимость ({self.baggage_capacity_kg} кг)")
-        self.actual_baggage_kg = weight
+        self._set_bounded("actual_baggage_kg", weight)
     
     def update_water(self, weight: int) -> None:
         """Обновляет вес воды"""
-        if weight > self.water_capacity:
-            raise ValueError(f"Вес воды ({weight} кг) превышает вместимость ({self.water_capacity} кг)")
-        self.actual_water_kg = weight
+        self._set_bounded("actual_water_kg", weight)
     
     def update_fuel(self, weight: int) -> None:
         """Обновляет вес топлива"""
-        if weight > self.fuel_capacity:
-            raise ValueError(f"Вес топлива ({weight} кг) превышает вместимость ({self.fuel_capacity} кг)")
-        self.actual_fuel_kg = weight
+        self._set_bounded("actual_fuel_kg", weight)
     
     def update_node_id(self, node_id: str) -> None:
         """Обновляет ID узла"""
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 from config.aircraft_config import Seat
 
@@ -20,4 +20,8 @@ class GenerateResponse(BaseModel):
 	seats: List[Seat]
 	
 class LandingResponse(BaseModel):
-	aircraft_id: str
\ No newline at end of file
+	aircraft_id: str
+	
+class AircraftIdResponse(BaseModel):
+	# До посадки ID самолету еще не назначен
+	aircraft_id: Optional[str]
\ No newline at end of file
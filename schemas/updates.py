@@ -0,0 +1,11 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+
+class CoordinatesUpdate(BaseModel):
+	# Строгий режим: значения не приводятся, лишние ключи отклоняются
+	model_config = ConfigDict(strict=True, extra="forbid")
+	
+	node_id: str
+	
+class CoordinatesResponse(BaseModel):
+	node_id: Optional[str]
\ No newline at end of file
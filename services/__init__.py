@@ -1,4 +1,4 @@
-from typing import Annotated
+from typing import Annotated, Optional
 from fastapi import Depends
 
 import redis.asyncio as redis
@@ -6,20 +6,29 @@ import redis.asyncio as redis
 from db.redis import get_redis_client
 from services.aircraft_service import AircraftService
 
+# Сервис не хранит состояния запроса, поэтому переиспользуется между запросами
+_service: Optional[AircraftService] = None
+
 async def get_aircraft_service(
     redis_client: Annotated[redis.Redis, Depends(get_redis_client)]
 ) -> AircraftService:
     """
-    Фабрика для создания AircraftService.
+    Возвращает общий экземпляр AircraftService.
     Используется как зависимость в FastAPI.
     
+    Экземпляр создается заново, только если сменился клиент Redis
+    (например, после перезапуска lifespan).
+    
     Args:
         redis_client: Клиент Redis
         
     Returns:
         AircraftService: Сервис для работы с инстансами самолетов
     """
-    return AircraftService(redis_client)
+    global _service
+    if _service is None or _service.redis is not redis_client:
+        _service = AircraftService(redis_client)
+    return _service
 
 # Аннотированная зависимость для удобного использования
-AircraftServiceDep = Annotated[AircraftService, Depends(get_aircraft_service)] 
\ No newline at end of file
+AircraftServiceDep = Annotated[AircraftService, Depends(get_aircraft_service)] 
@@ -1,97 +1,472 @@
+import asyncio
 import logging
 import random
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from fastapi import HTTPException
+from cachetools import LRUCache, TTLCache
 import redis.asyncio as redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import NoScriptError, RedisError
+from pydantic import ValidationError
 
 from models.aircraft_instance import AircraftInstance
 from config import aircraft_config
 
 logger = logging.getLogger("uvicorn")
 
+# Кэш записей рейсов в процессе: сглаживает повторные запросы по одному рейсу
+# во время посадки. Короткий TTL ограничивает устаревание данных между воркерами
+_FLIGHT_CACHE_SIZE = 1024
+_FLIGHT_CACHE_TTL = 5
+# Маппинг aircraft_id -> flight_id не меняется до удаления самолета, поэтому
+# хранится без TTL. Запись, устаревшая после удаления в другом воркере,
+# обнаруживается по отсутствию данных рейса и перечитывается из Redis
+_A2F_CACHE_SIZE = 10_000
+
+class AircraftNotFound(Exception):
+    """Самолет, его рейс или маппинг aircraft_id -> flight_id не найден в Redis (HTTP 404)"""
+
+class ValidationFailed(Exception):
+    """Данные самолета не прошли проверку (HTTP 400)"""
+
+class StorageError(Exception):
+    """Ошибка при работе с хранилищем самолетов (HTTP 500)"""
+
+# Короткие имена полей в HASH рейса: имена полей модели повторялись бы
+# в каждой записи и занимали большую часть ее объема в Redis
+_HASH_FIELDS = {
+    "id": "i",
+    "model": "m",
+    "flight_id": "f",
+    "node_id": "n",
+    "baggage_capacity_kg": "bc",
+    "passenger_capacity": "pc",
+    "water_capacity": "wc",
+    "fuel_capacity": "fc",
+    "actual_passengers": "ap",
+    "actual_baggage_kg": "ab",
+    "actual_water_kg": "aw",
+    "actual_fuel_kg": "af",
+}
+_MODEL_FIELDS = {short: name for name, short in _HASH_FIELDS.items()}
+# Целочисленные поля модели: в HASH они хранятся строками
+_INT_FIELDS = frozenset(
+    name for name, field in AircraftInstance.model_fields.items() if field.annotation is int
+)
+
+def _pack(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Переименовывает поля модели в короткие имена полей HASH"""
+    return {_HASH_FIELDS[name]: value for name, value in data.items()}
+
+def _unpack(data: Dict[str, str]) -> Dict[str, Any]:
+    """Переименовывает поля HASH обратно в имена полей модели и приводит целочисленные значения"""
+    fields = {}
+    for short, value in data.items():
+        name = _MODEL_FIELDS[short]
+        fields[name] = int(value) if name in _INT_FIELDS else value
+    return fields
+
+def _from_hash(data: Dict[str, Any]) -> AircraftInstance:
+    """
+    Инстанс из полей, прочитанных через _unpack. Данные записаны самим сервисом,
+    поэтому повторная валидация pydantic не выполняется
+    """
+    return AircraftInstance.model_construct(**data)
+
+def _decode_field(field_name: str, value: Optional[str]) -> Any:
+    """Приводит строковое значение поля из HASH к типу поля AircraftInstance"""
+    if value is not None and field_name in _INT_FIELDS:
+        return int(value)
+    return value
+
+# Конфигурация не меняется во время работы: список моделей строится один раз
+_AVAILABLE_MODELS = tuple(aircraft_config.aircraft.keys())
+_MODELS_SET = frozenset(_AVAILABLE_MODELS)
+# Вместимости по моделям: (пассажиры, багаж, вода, топливо)
+_MODEL_CAPS = {
+    model: (
+        config.passenger_capacity,
+        config.baggage_capacity_kg,
+        config.water_capacity,
+        config.fuel_capacity,
+    )
+    for model, config in aircraft_config.aircraft.items()
+}
+# Неизменная часть полей нового инстанса для каждой модели: модель и вместимости
+_MODEL_BASE_FIELDS = {
+    model: {
+        "model": model,
+        "baggage_capacity_kg": baggage_capacity_kg,
+        "passenger_capacity": passenger_capacity,
+        "water_capacity": water_capacity,
+        "fuel_capacity": fuel_capacity,
+    }
+    for model, (passenger_capacity, baggage_capacity_kg, water_capacity, fuel_capacity) in _MODEL_CAPS.items()
+}
+# Собственный генератор сервиса: не зависит от глобального состояния модуля random
+_rng = random.Random()
+
+# Короткие имена ключей экономят память Redis на каждой записи. Ключи заданы
+# байтами: redis-py передает bytes как есть, без кодирования на каждой команде
+_FLIGHT_PREFIX = b"f:"
+# Общий HASH маппингов aircraft_id -> flight_id (поле - ID самолета, значение - ID рейса).
+# Один HASH вместо строкового ключа на каждый самолет экономит память Redis (listpack)
+_AIRCRAFT_TO_FLIGHT = b"a2f"
+# Ключи прежней раскладки: JSON-строка рейса, строковый маппинг на каждый самолет
+# и множество всех рейсов. Переносятся в текущую раскладку при запуске (migrate_legacy_keys)
+_LEGACY_FLIGHT_PREFIX = "flight:"
+_LEGACY_MAPPING_PREFIX = "aircraft_to_flight:"
+_LEGACY_FLIGHTS_SET = "flights:all"
+# Версия раскладки ключей; записывается после переноса, чтобы следующие запуски не обходили ключи заново
+_LAYOUT_KEY = b"layout"
+_LAYOUT_VERSION = "2"
+
+def _flight_key(flight_id: str) -> bytes:
+    """Ключ HASH данных рейса"""
+    return _FLIGHT_PREFIX + flight_id.encode()
+
+# Удаление самолета: KEYS[1] - HASH маппингов a2f, ARGV[1] - ID самолета, ARGV[2] - префикс ключа данных рейса.
+# Возвращает {flight_id, удалено данных, удалено маппингов} или nil, если маппинга нет
+# Ключ рейса строится в скрипте по маппингу и не объявлен в KEYS: так поиск и удаление
+# занимают один round-trip. Это допустимо только на одном узле Redis; в Redis Cluster
+# ID рейса пришлось бы читать до вызова скрипта и передавать ключ рейса в KEYS
+_DELETE_AIRCRAFT_LUA = """
+local flight_id = redis.call('HGET', KEYS[1], ARGV[1])
+if not flight_id then
+    return false
+end
+local flight_deleted = redis.call('DEL', ARGV[2] .. flight_id)
+local mapping_deleted = redis.call('HDEL', KEYS[1], ARGV[1])
+return {flight_id, flight_deleted, mapping_deleted}
+"""
+
+# Перенос одного ключа прежней раскладки: KEYS[1] - старый строковый ключ, KEYS[2] - новый ключ,
+# ARGV[1] - прочитанное значение старого ключа, ARGV[2] - команда записи (HSET или HSETNX),
+# далее ее аргументы. Запись и удаление старого ключа выполняются атомарно и только если
+# старый ключ не изменился после чтения. Возвращает 1 - ключ перенесен, 0 - ключ уже изменен
+_MIGRATE_KEY_LUA = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call(ARGV[2], KEYS[2], unpack(ARGV, 3))
+redis.call('DEL', KEYS[1])
+return 1
+"""
+
+# Атомарное обновление одного поля рейса за один round-trip.
+# KEYS[1] - HASH маппингов a2f; ARGV: ID самолета, префикс ключа рейса,
+# поле, поле вместимости (пустая строка, если поле не ограничено), новое значение.
+# Возвращает {0} - нет маппинга, {1, flight_id} - нет данных рейса,
+# {2, flight_id, capacity} - превышена вместимость, {3, flight_id} - значение записано
+# Как и в _DELETE_AIRCRAFT_LUA, ключ рейса строится из маппинга внутри скрипта
+# и не объявлен в KEYS - скрипт рассчитан на один узел Redis, не на Redis Cluster
+_UPDATE_FIELD_LUA = """
+local flight_id = redis.call('HGET', KEYS[1], ARGV[1])
+if not flight_id then
+    return {0}
+end
+local flight_key = ARGV[2] .. flight_id
+if ARGV[4] == '' then
+    if redis.call('EXISTS', flight_key) == 0 then
+        return {1, flight_id}
+    end
+else
+    local capacity = redis.call('HGET', flight_key, ARGV[4])
+    if not capacity then
+        return {1, flight_id}
+    end
+    if tonumber(ARGV[5]) > tonumber(capacity) then
+        return {2, flight_id, capacity}
+    end
+end
+redis.call('HSET', flight_key, ARGV[3], ARGV[5])
+return {3, flight_id}
+"""
+
+# Чтение одного поля самолета по ID: KEYS[1] - HASH маппингов a2f, ARGV[1] - ID самолета,
+# ARGV[2] - префикс ключа рейса, ARGV[3] - поле. Поиск маппинга и чтение поля за один round-trip;
+# ключ рейса, как и в _UPDATE_FIELD_LUA, строится внутри скрипта (один узел Redis).
+# Возвращает {0} - нет маппинга, {1, flight_id} - нет данных рейса, {2, flight_id, значение или nil}
+_GET_FIELD_LUA = """
+local flight_id = redis.call('HGET', KEYS[1], ARGV[1])
+if not flight_id then
+    return {0}
+end
+local flight_key = ARGV[2] .. flight_id
+if redis.call('EXISTS', flight_key) == 0 then
+    return {1, flight_id}
+end
+return {2, flight_id, redis.call('HGET', flight_key, ARGV[3])}
+"""
+
+# Назначение ID самолета рейсу: KEYS[1] - HASH маппингов a2f, KEYS[2] - ключ рейса,
+# ARGV[1] - ID самолета, ARGV[2] - ID рейса, далее пары поле/значение для записи в рейс.
+# Маппинг резервируется через HSETNX, поля рейса пишутся только при успешном резервировании.
+# Возвращает 0 - нет данных рейса, 1 - ID самолета уже занят, 2 - ID назначен
+_SET_IDS_LUA = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    return 0
+end
+if redis.call('HSETNX', KEYS[1], ARGV[1], ARGV[2]) == 0 then
+    return 1
+end
+redis.call('HSET', KEYS[2], unpack(ARGV, 3))
+return 2
+"""
+
+def _queue_script(pipe: redis.client.Pipeline, script: AsyncScript, keys: List[Any], args: List[Any]) -> None:
+    """
+    Ставит вызов скрипта в пайплайн как EVALSHA. В отличие от script(client=pipe),
+    redis-py не добавляет перед пайплайном SCRIPT EXISTS, поэтому пайплайн остается
+    одним round-trip; NoScriptError в результате обрабатывает вызывающий код
+    """
+    pipe.evalsha(script.sha, len(keys), *keys, *args)
+
 class AircraftService:
     """Сервис для работы с инстансами самолетов в Redis"""
     
     def __init__(self, redis_client: redis.Redis):
         self.redis = redis_client
+        # flight_id -> поля HASH рейса; хранятся исходные данные, а не инстанс,
+        # чтобы изменения инстанса вызывающим кодом не попадали в кэш
+        self._flight_cache: TTLCache = TTLCache(maxsize=_FLIGHT_CACHE_SIZE, ttl=_FLIGHT_CACHE_TTL)
+        # aircraft_id -> flight_id для чтений по ID самолета
+        self._a2f_cache: LRUCache = LRUCache(maxsize=_A2F_CACHE_SIZE)
+        # Скрипт регистрируется один раз; вызывается через EVALSHA
+        self._delete_script = redis_client.register_script(_DELETE_AIRCRAFT_LUA)
+        self._update_field_script = redis_client.register_script(_UPDATE_FIELD_LUA)
+        self._set_ids_script = redis_client.register_script(_SET_IDS_LUA)
+        self._get_field_script = redis_client.register_script(_GET_FIELD_LUA)
+        self._migrate_key_script = redis_client.register_script(_MIGRATE_KEY_LUA)
+        # Обновления полей от конкурентных запросов, ожидающие отправки одним пайплайном,
+        # пока выполняется предыдущее обновление
+        self._pending_updates: List[Tuple[List[Any], asyncio.Future]] = []
+        self._update_in_flight = False
+        self._flush_task: Optional[asyncio.Task] = None
     
-    async def generate_random(self, flight_id: str, model: Optional[str] = None) -> AircraftInstance:
+    def invalidate(self, flight_id: str, aircraft_id: Optional[str] = None) -> None:
+        """Удаляет запись рейса (и маппинг самолета) из локального кэша после их изменения"""
+        self._flight_cache.pop(flight_id, None)
+        if aircraft_id is not None:
+            self._a2f_cache.pop(aircraft_id, None)
+    
+    async def _cached_flight_data(self, flight_id: str) -> Dict[str, str]:
+        """Поля рейса (с именами полей модели) из локального кэша или Redis; пустой словарь, если записи нет"""
+        data = self._flight_cache.get(flight_id)
+        if data is None:
+            data = _unpack(await self.redis.hgetall(_flight_key(flight_id)))
+            if data:
+                self._flight_cache[flight_id] = data
+        return data
+    
+    async def _read_field(self, flight_id: str, field_name: str) -> Tuple[int, Optional[str]]:
         """
-        Создает новый инстанс самолета со случайными данными и сохраняет по flight_id
+        Наличие записи рейса и значение одного ее поля за один round-trip.
+        EXISTS отличает отсутствующую запись от незаданного поля
+        """
+        flight_key = _flight_key(flight_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.exists(flight_key)
+            pipe.hget(flight_key, _HASH_FIELDS[field_name])
+            exists, value = await pipe.execute()
+        return exists, value
+    
+    def _random_aircraft_data(self, flight_id: str, model: Optional[str]) -> Dict[str, Any]:
+        """
+        Формирует поля нового инстанса самолета со случайной загрузкой
         
         Args:
             flight_id: ID рейса для создаваемого инстанса
-            model: Опциональная модель самолета, если не указана - выбирается случайная из конфигурации
+            model: Модель самолета; если не указана - выбирается случайная из конфигурации
             
         Returns:
-            AircraftInstance: Созданный инстанс самолета без ID (будет установлен позже)
+            Dict[str, Any]: Поля инстанса для записи в Redis
         """
-        logger.info(f"Генерация случайного самолета для рейса {flight_id}, модель={model or 'случайная'}")
-        
         # Если модель не указана, выбираем случайную из конфигурации
-        available_models = list(aircraft_config.aircraft.keys())
         if not model:
-            if not available_models:
+            if not _AVAILABLE_MODELS:
                 logger.error("В конфигурации не найдены модели самолетов")
                 raise ValueError("В конфигурации не найдены модели самолетов")
-            model = random.choice(available_models)
-            logger.info(f"Выбрана случайная модель: {model}")
-        elif model not in available_models:
-            logger.error(f"Модель самолета '{model}' не найдена в конфигурации")
+            model = _rng.choice(_AVAILABLE_MODELS)
+            logger.info("Выбрана случайная модель: %s", model)
+        elif model not in _MODELS_SET:
+            logger.error("Модель самолета '%s' не найдена в конфигурации", model)
             raise ValueError(f"Модель самолета '{model}' не найдена в конфигурации")
             
-        # Получаем конфигурационные данные для этой модели
-        config_data = aircraft_config.aircraft[model]
-        logger.debug(f"Получены конфигурационные данные для модели {model}")
-        
-        # Генерируем случайное количество пассажиров и вес багажа
-        passenger_capacity = config_data.passenger_capacity
-        baggage_capacity_kg = config_data.baggage_capacity_kg
-        water_capacity = config_data.water_capacity
-        fuel_capacity = config_data.fuel_capacity
-        
-        actual_passengers = random.randint(0, passenger_capacity)
-        actual_baggage_kg = random.randint(0, baggage_capacity_kg)
-        actual_water_kg = random.randint(0, water_capacity)
-        actual_fuel_kg = random.randint(0, fuel_capacity)
-        
-        logger.debug(f"Сгенерированы данные: passengers={actual_passengers}/{passenger_capacity}, " +
-                     f"baggage={actual_baggage_kg}/{baggage_capacity_kg}, " +
-                     f"water={actual_water_kg}/{water_capacity}, " +
-                     f"fuel={actual_fuel_kg}/{fuel_capacity}")
-        
-        # Создаем данные инстанса
-        aircraft_data = {
-            "model": model,
+        # Получаем заранее вычисленные вместимости для этой модели
+        passenger_capacity, baggage_capacity_kg, water_capacity, fuel_capacity = _MODEL_CAPS[model]
+        
+        # Генерируем случайную загрузку (от 0 до вместимости включительно)
+        actual_passengers = _rng.randrange(passenger_capacity + 1)
+        actual_baggage_kg = _rng.randrange(baggage_capacity_kg + 1)
+        actual_water_kg = _rng.randrange(water_capacity + 1)
+        actual_fuel_kg = _rng.randrange(fuel_capacity + 1)
+        
+        logger.debug(
+            "Сгенерированы данные: passengers=%s/%s, baggage=%s/%s, water=%s/%s, fuel=%s/%s",
+            actual_passengers, passenger_capacity,
+            actual_baggage_kg, baggage_capacity_kg,
+            actual_water_kg, water_capacity,
+            actual_fuel_kg, fuel_capacity,
+        )
+        
+        # Создаем данные инстанса: к заранее собранным полям модели
+        # добавляются только рейс и сгенерированная загрузка
+        return {
+            **_MODEL_BASE_FIELDS[model],
             "flight_id": flight_id,
-            "baggage_capacity_kg": baggage_capacity_kg,
-            "passenger_capacity": passenger_capacity,
-            "water_capacity": water_capacity,
-            "fuel_capacity": fuel_capacity,
             "actual_passengers": actual_passengers,
             "actual_baggage_kg": actual_baggage_kg,
             "actual_water_kg": actual_water_kg,
             "actual_fuel_kg": actual_fuel_kg
         }
+    
+    async def generate_random(self, flight_id: str, model: Optional[str] = None) -> AircraftInstance:
+        """
+        Создает новый инстанс самолета со случайными данными и сохраняет по flight_id
         
-        # Создаем инстанс самолета (без ID)
-        aircraft = AircraftInstance(**aircraft_data)
-        
-        # Логируем данные перед сохранением
-        logger.info(f"Сохранение инстанса самолета: flight_id={flight_id}, model={model}")
+        Args:
+            flight_id: ID рейса для создаваемого инстанса
+            model: Опциональная модель самолета, если не указана - выбирается случайная из конфигурации
+            
+        Returns:
+            AircraftInstance: Созданный инстанс самолета без ID (будет установлен позже)
+        """
+        logger.info("Генерация случайного самолета для рейса %s, модель=%s", flight_id, model or "случайная")
         
-        # Сохраняем в Redis по ключу flight_id
-        flight_key = f"flight:{flight_id}"
-        await self.redis.set(flight_key, aircraft.model_dump_json())
+        aircraft_data = self._random_aircraft_data(flight_id, model)
         
-        # Добавляем flight_id в набор всех рейсов
-        await self.redis.sadd("flights:all", flight_id)
+        # Создаем инстанс самолета (без ID). Значения получены из конфигурации
+        # и генератора и заведомо корректны, поэтому валидация не нужна
+        aircraft = AircraftInstance.model_construct(**aircraft_data)
         
-        logger.info(f"Создан и сохранен случайный инстанс самолета: {aircraft.model} для рейса {aircraft.flight_id} (без ID)")
+        # Логируем данные перед сохранением
+        logger.info("Сохранение инстанса самолета: flight_id=%s, model=%s", flight_id, aircraft.model)
+        
+        # Сохраняем в Redis HASH по ключу flight_id (с заменой прежней записи рейса)
+        flight_key = _flight_key(flight_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(flight_key)
+            # Исходный словарь уже содержит только заданные поля, поэтому
+            # пишется напрямую без повторной сериализации модели
+            pipe.hset(flight_key, mapping=_pack(aircraft_data))
+            await pipe.execute()
+        self.invalidate(flight_id)
+        
+        logger.info("Создан и сохранен случайный инстанс самолета: %s для рейса %s (без ID)", aircraft.model, aircraft.flight_id)
         return aircraft
     
-    async def get_by_flight_id(self, flight_id: str) -> Optional[AircraftInstance]:
+    async def generate_random_bulk(self, flight_ids: List[str], model: Optional[str] = None) -> List[AircraftInstance]:
+        """
+        Создает инстансы самолетов со случайными данными для нескольких рейсов
+        и сохраняет их одним пайплайном (для заполнения тестовых данных)
+        
+        Args:
+            flight_ids: ID рейсов для создаваемых инстансов
+            model: Опциональная модель самолета для всех рейсов, если не указана - выбирается случайная для каждого
+            
+        Returns:
+            List[AircraftInstance]: Созданные инстансы самолетов без ID
+        """
+        logger.info("Генерация случайных самолетов для %s рейсов, модель=%s", len(flight_ids), model or "случайная")
+        if not flight_ids:
+            return []
+        
+        aircraft_data = [self._random_aircraft_data(flight_id, model) for flight_id in flight_ids]
+        
+        # Все записи уходят за один round-trip
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for data in aircraft_data:
+                flight_key = _flight_key(data["flight_id"])
+                pipe.delete(flight_key)
+                pipe.hset(flight_key, mapping=_pack(data))
+            await pipe.execute()
+        for flight_id in flight_ids:
+            self.invalidate(flight_id)
+        
+        logger.info("Создано и сохранено %s случайных инстансов самолетов (без ID)", len(flight_ids))
+        return [AircraftInstance.model_construct(**data) for data in aircraft_data]
+    
+    async def list_flight_ids(self) -> AsyncIterator[str]:
+        """
+        Перебирает ID всех рейсов, для которых сохранены данные самолета.
+        Ключи обходятся через SCAN, не блокируя Redis на больших базах.
+        
+        Yields:
+            str: ID рейса
+        """
+        prefix_len = len(_FLIGHT_PREFIX)
+        async for key in self.redis.scan_iter(match=_FLIGHT_PREFIX + b"*", count=500):
+            yield key[prefix_len:]
+    
+    async def migrate_legacy_keys(self) -> None:
+        """
+        Переносит записи, сохраненные прежней раскладкой ключей (flight:*,
+        aircraft_to_flight:*, flights:all), в HASH f:* и общий HASH a2f.
+        Без переноса самолеты, находящиеся в рейсе во время обновления сервиса,
+        перестали бы находиться по ID.
+        
+        Каждый ключ переносится отдельным вызовом _MIGRATE_KEY_LUA: запись в новую
+        раскладку и удаление старого ключа атомарны, поэтому обрыв соединения не теряет
+        данных, а одновременный запуск воркеров не переносит запись дважды. Маппинг
+        пишется через HSETNX и не перезаписывает уже назначенный. Записи, которые не
+        удалось разобрать, остаются на месте. После переноса записывается версия
+        раскладки, и следующие запуски не обходят ключи. Недоступный Redis не мешает
+        запуску: перенос выполнится при следующем старте
+        """
+        try:
+            if await self.redis.get(_LAYOUT_KEY) == _LAYOUT_VERSION:
+                return
+            
+            flight_keys = [key async for key in self.redis.scan_iter(match=_LEGACY_FLIGHT_PREFIX + "*", count=500)]
+            mapping_keys = [key async for key in self.redis.scan_iter(match=_LEGACY_MAPPING_PREFIX + "*", count=500)]
+            
+            migrated = mappings = 0
+            if flight_keys or mapping_keys:
+                # Чтение не изменяет старые ключи
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for key in flight_keys + mapping_keys:
+                        pipe.get(key)
+                    values = await pipe.execute(raise_on_error=False)
+                
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for key, raw in zip(flight_keys, values):
+                        if not isinstance(raw, str):
+                            continue
+                        try:
+                            aircraft = AircraftInstance.model_validate_json(raw)
+                        except ValidationError as e:
+                            logger.warning("Запись %s прежнего формата не перенесена и оставлена на месте: %s", key, e)
+                            continue
+                        args = [raw, "HSET"]
+                        for item in _pack(aircraft.model_dump(exclude_none=True)).items():
+                            args.extend(item)
+                        await self._migrate_key_script(
+                            keys=[key, _flight_key(key[len(_LEGACY_FLIGHT_PREFIX):])], args=args, client=pipe
+                        )
+                        migrated += 1
+                    for key, flight_id in zip(mapping_keys, values[len(flight_keys):]):
+                        if isinstance(flight_id, str):
+                            await self._migrate_key_script(
+                                keys=[key, _AIRCRAFT_TO_FLIGHT],
+                                args=[flight_id, "HSETNX", key[len(_LEGACY_MAPPING_PREFIX):], flight_id],
+                                client=pipe,
+                            )
+                            mappings += 1
+                    await pipe.execute()
+                self._flight_cache.clear()
+                self._a2f_cache.clear()
+            
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.delete(_LEGACY_FLIGHTS_SET)
+                pipe.set(_LAYOUT_KEY, _LAYOUT_VERSION)
+                await pipe.execute()
+            
+            logger.info("Перенесено записей прежнего формата: рейсов %s, маппингов %s", migrated, mappings)
+        except (RedisError, OSError) as e:
+            logger.warning("Не удалось перенести записи прежнего формата: %s", e)
+    
+    async def get_by_flight_id(self, flight_id: str) -> AircraftInstance:
         """
         Получает инстанс самолета по ID рейса
         
@@ -99,20 +474,23 @@ class AircraftService:
             flight_id: ID рейса
             
         Returns:
-            Optional[AircraftInstance]: Инстанс самолета или None, если не найден
+            AircraftInstance: Инстанс самолета
+            
+        Raises:
+            AircraftNotFound: Данных рейса нет в Redis
         """
-        logger.info(f"Получение самолета по ID рейса: {flight_id}")
+        logger.info("Получение самолета по ID рейса: %s", flight_id)
         
-        # Если нет маппинга, пробуем получить напрямую по flight_id
-        flight_key = f"flight:{flight_id}"
-        data = await self.redis.get(flight_key)
+        # Данные рейса читаются по ключу f:{flight_id} (или из локального кэша)
+        data = await self._cached_flight_data(flight_id)
         
         if not data:
-            logger.warning(f"Самолет для рейса {flight_id} не найден")
-            raise HTTPException(status_code=404, detail=f"Самолет для рейса {flight_id} не найден")
+            logger.warning("Самолет для рейса %s не найден", flight_id)
+            raise AircraftNotFound(f"Самолет для рейса {flight_id} не найден")
         
-        aircraft = AircraftInstance.model_validate_json(data)
-        logger.info(f"Найден самолет для рейса {flight_id}: model={aircraft.model}, id={aircraft.id or 'не назначен'}")
+        # Числовые поля уже приведены к int в _unpack, поэтому инстанс строится без валидации
+        aircraft = _from_hash(data)
+        logger.info("Найден самолет для рейса %s: model=%s, id=%s", flight_id, aircraft.model, aircraft.id or "не назначен")
         return aircraft
     
     async def set_aircraft_id(self, flight_id: str, aircraft_id: str) -> AircraftInstance:
@@ -126,112 +504,118 @@ class AircraftService:
         Returns:
             AircraftInstance: Обновленный инстанс самолета с установленным ID
         """
-        logger.info(f"Установка ID самолета: flight_id={flight_id}, aircraft_id={aircraft_id}")
-        
-        # Получаем инстанс по flight_id
-        aircraft = await self.get_by_flight_id(flight_id)
-        
-        try:
-            # Проверяем, не существует ли уже самолет с таким ID
-            existing = await self.get_by_id(aircraft_id)
-            if existing:
-                logger.error(f"Самолет с ID {aircraft_id} уже существует")
-                raise HTTPException(status_code=400, detail=f"Самолет с ID {aircraft_id} уже существует")
-        except HTTPException as e:
-            if e.status_code != 404:
-                # Если ошибка не "не найден", то пробрасываем дальше
-                raise
-
-        # Устанавливаем ID
-        aircraft.id = aircraft_id
-        # Сохраняем в Redis по новому ключу flight_id
-        flight_key = f"flight:{flight_id}"
-        # Обновляем объект с установленным ID
-        await self.redis.set(flight_key, aircraft.model_dump_json())
-        
-        # Создаем маппинги для быстрого поиска
-        # aircraft_id -> flight_id
-        await self.redis.set(f"aircraft_to_flight:{aircraft_id}", flight_id)
-        
-        logger.info(f"Установлен ID {aircraft_id} для инстанса самолета: {aircraft.model} для рейса {flight_id}")
-        return aircraft
+        return await self.set_ids(flight_id, aircraft_id)
     
-    async def get_by_id(self, aircraft_id: str) -> Optional[AircraftInstance]:
+    async def set_ids(
+        self,
+        flight_id: str,
+        aircraft_id: str,
+        node_id: Optional[str] = None,
+        aircraft: Optional[AircraftInstance] = None,
+    ) -> AircraftInstance:
         """
-        Получает инстанс самолета по ID
+        Устанавливает ID самолета и (опционально) ID узла одной записью в Redis.
+        Маппинг aircraft_id -> flight_id резервируется атомарно через HSETNX,
+        поэтому два одновременных запроса не могут занять один и тот же ID.
         
         Args:
-            aircraft_id: ID самолета
+            flight_id: ID рейса самолета
+            aircraft_id: ID для установки
+            node_id: ID узла для установки
+            aircraft: Уже загруженный инстанс рейса; если не передан, читается из Redis
             
         Returns:
-            Optional[AircraftInstance]: Инстанс самолета или None, если не найден
+            AircraftInstance: Обновленный инстанс самолета с установленными ID
         """
-        logger.info(f"Получение самолета по ID: {aircraft_id}")
-        
-        # Сначала проверяем маппинг aircraft_id -> flight_id
-        flight_id = await self.redis.get(f"aircraft_to_flight:{aircraft_id}")
-        
-        if not flight_id:
-            logger.warning(f"Маппинг aircraft_id -> flight_id для {aircraft_id} не найден")
-            raise HTTPException(status_code=404, detail=f"Маппинг aircraft_id -> flight_id для {aircraft_id} не найден")
-        
-        flight_id_str = flight_id.decode('utf-8') if isinstance(flight_id, bytes) else flight_id
-        logger.info(f"Найден маппинг aircraft_id -> flight_id: {aircraft_id} -> {flight_id_str}")
-        
-        # Ищем по flight_id
-        flight_key = f"flight:{flight_id_str}"
-        data = await self.redis.get(flight_key)
-        
-        if not data:
-            logger.warning(f"Маппинг найден, но данные по flight_id {flight_id_str} не найдены")
-            raise HTTPException(status_code=404, detail=f"Данные по flight_id {flight_id_str} не найдены")
+        logger.info("Установка ID самолета: flight_id=%s, aircraft_id=%s, node_id=%s", flight_id, aircraft_id, node_id)
+        
+        changed = {"id": aircraft_id}
+        if node_id is not None:
+            changed["node_id"] = node_id
+        flight_key = _flight_key(flight_id)
+        script_keys = [_AIRCRAFT_TO_FLIGHT, flight_key]
+        script_args = [aircraft_id, flight_id]
+        for item in _pack(changed).items():
+            script_args.extend(item)
+        
+        # Чтение данных рейса (если инстанс еще не загружен), резервирование маппинга
+        # и запись ID в рейс выполняются за один round-trip
+        if aircraft is None:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hgetall(flight_key)
+                _queue_script(pipe, self._set_ids_script, script_keys, script_args)
+                data, status = await pipe.execute(raise_on_error=False)
+            if isinstance(data, Exception):
+                raise data
+            # Скрипт выгружен из кэша Redis: повторный вызов загружает его заново.
+            # HGETALL выполнен до скрипта, поэтому data совпадает с записью до назначения ID
+            if isinstance(status, NoScriptError):
+                status = await self._set_ids_script(keys=script_keys, args=script_args)
+            elif isinstance(status, Exception):
+                raise status
+        else:
+            data = None
+            status = await self._set_ids_script(keys=script_keys, args=script_args)
+        
+        if status == 0:
+            logger.warning("Самолет для рейса %s не найден", flight_id)
+            raise AircraftNotFound(f"Самолет для рейса {flight_id} не найден")
+        
+        # Маппинг уже занят - самолет с таким ID существует
+        if status == 1:
+            logger.error("Самолет с ID %s уже существует", aircraft_id)
+            raise ValidationFailed(f"Самолет с ID {aircraft_id} уже существует")
+        
+        if aircraft is None:
+            aircraft = _from_hash(_unpack(data))
+        
+        # Устанавливаем ID в инстансе так же, как они записаны в Redis
+        aircraft.id = aircraft_id
+        if node_id is not None:
+            aircraft.update_node_id(node_id)
+        self.invalidate(flight_id, aircraft_id)
         
-        aircraft = AircraftInstance.model_validate_json(data)
-        logger.info(f"Найден самолет: ID={aircraft_id}, model={aircraft.model}, flight_id={aircraft.flight_id}")
+        logger.info("Установлен ID %s для инстанса самолета: %s для рейса %s", aircraft_id, aircraft.model, flight_id)
         return aircraft
     
-    async def update(self, aircraft: AircraftInstance) -> AircraftInstance:
+    async def get_field(self, aircraft_id: str, field_name: str) -> Optional[Any]:
         """
-        Обновляет инстанс самолета в Redis
+        Получает значение одного поля инстанса самолета по ID без построения
+        модели AircraftInstance и валидации остальных полей
         
         Args:
-            aircraft: Инстанс самолета для обновления (должен содержать id)
+            aircraft_id: ID самолета
+            field_name: Имя поля инстанса (например, actual_passengers)
             
         Returns:
-            AircraftInstance: Обновленный инстанс самолета
+            Optional[Any]: Значение поля или None, если поле не задано
         """
-        logger.info(f"Обновление самолета: ID={aircraft.id}, model={aircraft.model}")
-        
-        # Проверяем наличие ID самолета
-        if not aircraft.id:
-            logger.error("ID самолета не указан при попытке обновления")
-            raise HTTPException(status_code=400, detail="ID самолета не указан")
-            
-        # Проверяем, есть ли маппинг для ID самолета
-        flight_id = await self.redis.get(f"aircraft_to_flight:{aircraft.id}")
-        if not flight_id:
-            logger.warning(f"Маппинг aircraft_id -> flight_id для {aircraft.id} не найден")
-            raise HTTPException(status_code=404, detail=f"Маппинг aircraft_id -> flight_id для {aircraft.id} не найден")
-        
-        # Получаем ID рейса из маппинга
-        flight_id_str = flight_id.decode('utf-8') if isinstance(flight_id, bytes) else flight_id
-        logger.info(f"Найден маппинг aircraft_id -> flight_id: {aircraft.id} -> {flight_id_str}")
-        
-        # Проверяем, существует ли рейс с таким ID
-        flight_key = f"flight:{flight_id_str}"
-        data = await self.redis.get(flight_key)
-        if not data:
-            logger.warning(f"Данные по flight_id {flight_id_str} не найдены")
-            raise HTTPException(status_code=404, detail=f"Данные по flight_id {flight_id_str} не найдены")
-        
-        # Логируем данные перед сохранением
-        logger.debug(f"Сохранение обновленных данных: {aircraft.model_dump_json()}")
-        
-        # Сохраняем обновленные данные по ключу flight_id
-        await self.redis.set(flight_key, aircraft.model_dump_json())
-        
-        logger.info(f"Обновлены данные самолета с ID {aircraft.id} для рейса {flight_id_str}")
-        return aircraft
+        # Маппинг берется из локального кэша, если он уже известен
+        flight_id_str = self._a2f_cache.get(aircraft_id)
+        if flight_id_str is not None:
+            exists, value = await self._read_field(flight_id_str, field_name)
+            if exists:
+                return _decode_field(field_name, value)
+            # Маппинг из кэша мог устареть: самолет удален в другом воркере
+            self._a2f_cache.pop(aircraft_id, None)
+        
+        # Поиск маппинга и чтение только нужного поля выполняются одним Lua-скриптом
+        result = await self._get_field_script(
+            keys=[_AIRCRAFT_TO_FLIGHT],
+            args=[aircraft_id, _FLIGHT_PREFIX, _HASH_FIELDS[field_name]],
+        )
+        status = result[0]
+        if status == 0:
+            logger.warning("Маппинг aircraft_id -> flight_id для %s не найден", aircraft_id)
+            raise AircraftNotFound(f"Маппинг aircraft_id -> flight_id для {aircraft_id} не найден")
+        
+        flight_id_str = result[1]
+        if status == 1:
+            logger.warning("Маппинг найден, но данные по flight_id %s не найдены", flight_id_str)
+            raise AircraftNotFound(f"Данные по flight_id {flight_id_str} не найдены")
+        
+        self._a2f_cache[aircraft_id] = flight_id_str
+        return _decode_field(field_name, result[2])
     
     async def delete(self, aircraft_id: str) -> bool:
         """
@@ -243,217 +627,190 @@ class AircraftService:
         Returns:
             bool: True если удаление успешно, иначе False
         """
-        logger.info(f"Запрос на удаление самолета: ID={aircraft_id}")
+        logger.info("Запрос на удаление самолета: ID=%s", aircraft_id)
         
         try:
-            # Получаем маппинг aircraft_id -> flight_id
-            flight_id = await self.redis.get(f"aircraft_to_flight:{aircraft_id}")
-            if not flight_id:
-                logger.warning(f"Маппинг aircraft_id -> flight_id для {aircraft_id} не найден при попытке удаления")
+            # Поиск маппинга и удаление всех записей рейса выполняются
+            # одним атомарным Lua-скриптом за один round-trip
+            result = await self._delete_script(
+                keys=[_AIRCRAFT_TO_FLIGHT],
+                args=[aircraft_id, _FLIGHT_PREFIX],
+            )
+            if not result:
+                logger.warning("Маппинг aircraft_id -> flight_id для %s не найден при попытке удаления", aircraft_id)
                 return False
             
-            # Преобразуем bytes в строку, если необходимо
-            flight_id_str = flight_id.decode('utf-8') if isinstance(flight_id, bytes) else flight_id
-            logger.info(f"Найден маппинг aircraft_id -> flight_id: {aircraft_id} -> {flight_id_str} для удаления")
-            
-            # Удаляем данные по ключу flight:{flight_id}
-            flight_key = f"flight:{flight_id_str}"
-            flight_deleted = await self.redis.delete(flight_key)
+            flight_id_str, flight_deleted, mapping_deleted = result
+            self.invalidate(flight_id_str, aircraft_id)
             
-            # Удаляем маппинг aircraft_id -> flight_id
-            mapping_deleted = await self.redis.delete(f"aircraft_to_flight:{aircraft_id}")
-            
-            # Удаляем flight_id из набора всех рейсов
-            await self.redis.srem("flights:all", flight_id_str)
-            
-            logger.info(f"Удален инстанс самолета с ID {aircraft_id} для рейса {flight_id_str}. Статус: данные={flight_deleted}, маппинг={mapping_deleted}")
+            logger.info("Удален инстанс самолета с ID %s для рейса %s. Статус: данные=%s, маппинг=%s", aircraft_id, flight_id_str, flight_deleted, mapping_deleted)
             
             # Успешно удалено, если хотя бы одна запись была удалена
             return flight_deleted > 0 or mapping_deleted > 0
         except Exception as e:
-            logger.error(f"Ошибка при удалении самолета с ID {aircraft_id}: {str(e)}")
-            raise HTTPException(
-                status_code=500, 
-                detail=f"Ошибка при удалении самолета: {str(e)}"
-            )
+            logger.error("Ошибка при удалении самолета с ID %s: %s", aircraft_id, e)
+            raise StorageError(f"Ошибка при удалении самолета: {e}") from e
     
-    async def update_passengers(self, aircraft_id: str, count: int) -> Optional[AircraftInstance]:
+    async def _batched_update(self, args: List[Any]) -> List[Any]:
         """
-        Обновляет количество пассажиров
+        Выполняет _UPDATE_FIELD_LUA с пакетированием под нагрузкой.
+        Если других обновлений не выполняется, скрипт вызывается сразу (один EVALSHA).
+        Обновления, пришедшие, пока предыдущее еще выполняется, накапливаются
+        и отправляются следующим пакетом одним пайплайном
         
         Args:
-            aircraft_id: ID самолета
-            count: Новое количество пассажиров
+            args: Аргументы скрипта (ARGV)
             
         Returns:
-            Optional[AircraftInstance]: Обновленный инстанс самолета или None, если не найден
+            List[Any]: Результат скрипта для этого вызова
         """
-        logger.info(f"Запрос на обновление количества пассажиров: aircraft_id={aircraft_id}, count={count}")
+        if self._update_in_flight:
+            future = asyncio.get_running_loop().create_future()
+            self._pending_updates.append((args, future))
+            return await future
         
+        self._update_in_flight = True
         try:
-            # Получаем текущий инстанс
-            current = await self.get_by_id(aircraft_id)
-            logger.info(f"Текущее количество пассажиров: {current.actual_passengers}/{current.passenger_capacity}")
-            
-            # Применяем обновление через метод модели
-            current.update_passengers(count)
-            logger.info(f"Новое количество пассажиров: {current.actual_passengers}/{current.passenger_capacity}")
-            
-            # Сохраняем обновленный инстанс
-            updated = await self.update(current)
-            logger.info(f"Количество пассажиров успешно обновлено: aircraft_id={aircraft_id}, count={count}")
-            return updated
-        except ValueError as e:
-            # Перехватываем ошибки валидации из модели
-            logger.error(f"Ошибка валидации при обновлении количества пассажиров: {str(e)}")
-            raise HTTPException(status_code=400, detail=str(e))
-        except HTTPException as e:
-            logger.error(f"HTTP ошибка при обновлении количества пассажиров: {e.status_code} - {e.detail}")
-            raise e
+            return await self._update_field_script(keys=[_AIRCRAFT_TO_FLIGHT], args=args)
+        finally:
+            if self._pending_updates:
+                # Накопленные обновления отправляет фоновая задача, чтобы не задерживать ответ
+                self._flush_task = asyncio.create_task(self._flush_updates())
+            else:
+                self._update_in_flight = False
+    
+    async def _flush_updates(self) -> None:
+        """Отправляет накопленные обновления полей пакетами, пока очередь не опустеет"""
+        try:
+            while self._pending_updates:
+                batch, self._pending_updates = self._pending_updates, []
+                await self._send_updates(batch)
+        finally:
+            self._update_in_flight = False
+            self._flush_task = None
+    
+    async def _send_updates(self, batch: List[Tuple[List[Any], asyncio.Future]]) -> None:
+        """Выполняет пакет вызовов _UPDATE_FIELD_LUA и раздает результаты ожидающим"""
+        keys = [_AIRCRAFT_TO_FLIGHT]
+        try:
+            if len(batch) == 1:
+                results = [await self._update_field_script(keys=keys, args=batch[0][0])]
+            else:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for args, _ in batch:
+                        _queue_script(pipe, self._update_field_script, keys, args)
+                    results = await pipe.execute(raise_on_error=False)
+                # Скрипт выгружен из кэша Redis (SCRIPT FLUSH, перезапуск): вызов
+                # через объект скрипта загружает его заново
+                for i, result in enumerate(results):
+                    if isinstance(result, NoScriptError):
+                        try:
+                            results[i] = await self._update_field_script(keys=keys, args=batch[i][0])
+                        except Exception as e:
+                            results[i] = e
         except Exception as e:
-            logger.error(f"Ошибка при обновлении количества пассажиров: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Ошибка при обновлении количества пассажиров: {str(e)}")
+            results = [e] * len(batch)
+        
+        # Ошибка отдельной команды передается только ее вызывающему коду
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
     
-    async def update_baggage(self, aircraft_id: str, weight: int) -> Optional[AircraftInstance]:
+    async def _update_field(self, aircraft_id: str, field: str, value: Any) -> None:
+        """
+        Устанавливает значение одного поля рейса (с проверкой вместимости для
+        ограниченных полей) одним Lua-скриптом на стороне Redis, без чтения
+        записи рейса в приложение
+        
+        Args:
+            aircraft_id: ID самолета
+            field: Поле модели (например, actual_passengers)
+            value: Новое значение
+        """
+        capacity_field = AircraftInstance.capacity_field(field)
+        result = await self._batched_update([
+            aircraft_id,
+            _FLIGHT_PREFIX,
+            _HASH_FIELDS[field],
+            _HASH_FIELDS[capacity_field] if capacity_field else "",
+            value,
+        ])
+        status = result[0]
+        if status == 0:
+            logger.warning("Маппинг aircraft_id -> flight_id для %s не найден", aircraft_id)
+            raise AircraftNotFound(f"Маппинг aircraft_id -> flight_id для {aircraft_id} не найден")
+        
+        flight_id_str = result[1]
+        if status == 1:
+            logger.warning("Данные по flight_id %s не найдены", flight_id_str)
+            raise AircraftNotFound(f"Данные по flight_id {flight_id_str} не найдены")
+        if status == 2:
+            message = AircraftInstance.capacity_error(field, value, int(result[2]))
+            logger.error("Ошибка валидации при обновлении самолета %s: %s", aircraft_id, message)
+            raise ValidationFailed(message)
+        
+        self.invalidate(flight_id_str)
+    
+    async def update_passengers(self, aircraft_id: str, count: int) -> None:
+        """
+        Обновляет количество пассажиров
+        
+        Args:
+            aircraft_id: ID самолета
+            count: Новое количество пассажиров
+        """
+        logger.debug("Запрос на обновление количества пассажиров: aircraft_id=%s, count=%s", aircraft_id, count)
+        await self._update_field(aircraft_id, "actual_passengers", count)
+        logger.info("Количество пассажиров успешно обновлено: aircraft_id=%s, count=%s", aircraft_id, count)
+    
+    async def update_baggage(self, aircraft_id: str, weight: int) -> None:
         """
         Обновляет вес багажа
         
         Args:
             aircraft_id: ID самолета
             weight: Новый вес багажа в кг
-            
-        Returns:
-            Optional[AircraftInstance]: Обновленный инстанс самолета или None, если не найден
         """
-        logger.info(f"Запрос на обновление веса багажа: aircraft_id={aircraft_id}, weight={weight}")
-        
-        try:
-            # Получаем текущий инстанс
-            current = await self.get_by_id(aircraft_id)
-            logger.info(f"Текущий вес багажа: {current.actual_baggage_kg}/{current.baggage_capacity_kg}")
-            
-            # Применяем обновление через метод модели
-            current.update_baggage(weight)
-            logger.info(f"Новый вес багажа: {current.actual_baggage_kg}/{current.baggage_capacity_kg}")
-            
-            # Сохраняем обновленный инстанс
-            updated = await self.update(current)
-            logger.info(f"Вес багажа успешно обновлен: aircraft_id={aircraft_id}, weight={weight}")
-            return updated
-        except ValueError as e:
-            # Перехватываем ошибки валидации из модели
-            logger.error(f"Ошибка валидации при обновлении веса багажа: {str(e)}")
-            raise HTTPException(status_code=400, detail=str(e))
-        except HTTPException as e:
-            logger.error(f"HTTP ошибка при обновлении веса багажа: {e.status_code} - {e.detail}")
-            raise e
-        except Exception as e:
-            logger.error(f"Ошибка при обновлении веса багажа: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Ошибка при обновлении веса багажа: {str(e)}")
-            
-    async def update_water(self, aircraft_id: str, weight: int) -> Optional[AircraftInstance]:
+        logger.debug("Запрос на обновление веса багажа: aircraft_id=%s, weight=%s", aircraft_id, weight)
+        await self._update_field(aircraft_id, "actual_baggage_kg", weight)
+        logger.info("Вес багажа успешно обновлен: aircraft_id=%s, weight=%s", aircraft_id, weight)
+    
+    async def update_water(self, aircraft_id: str, weight: int) -> None:
         """
         Обновляет вес воды
         
         Args:
             aircraft_id: ID самолета
             weight: Новый вес воды в кг
-            
-        Returns:
-            Optional[AircraftInstance]: Обновленный инстанс самолета или None, если не найден
         """
-        logger.info(f"Запрос на обновление веса воды: aircraft_id={aircraft_id}, weight={weight}")
-        
-        try:
-            # Получаем текущий инстанс
-            current = await self.get_by_id(aircraft_id)
-            logger.info(f"Текущий вес воды: {current.actual_water_kg}/{current.water_capacity}")
-            
-            # Применяем обновление через метод модели
-            current.update_water(weight)
-            logger.info(f"Новый вес воды: {current.actual_water_kg}/{current.water_capacity}")
-            
-            # Сохраняем обновленный инстанс
-            updated = await self.update(current)
-            logger.info(f"Вес воды успешно обновлен: aircraft_id={aircraft_id}, weight={weight}")
-            return updated
-        except ValueError as e:
-            # Перехватываем ошибки валидации из модели
-            logger.error(f"Ошибка валидации при обновлении веса воды: {str(e)}")
-            raise HTTPException(status_code=400, detail=str(e))
-        except HTTPException as e:
-            logger.error(f"HTTP ошибка при обновлении веса воды: {e.status_code} - {e.detail}")
-            raise e
-        except Exception as e:
-            logger.error(f"Ошибка при обновлении веса воды: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Ошибка при обновлении веса воды: {str(e)}")
-            
-    async def update_fuel(self, aircraft_id: str, weight: int) -> Optional[AircraftInstance]:
+        logger.debug("Запрос на обновление веса воды: aircraft_id=%s, weight=%s", aircraft_id, weight)
+        await self._update_field(aircraft_id, "actual_water_kg", weight)
+        logger.info("Вес воды успешно обновлен: aircraft_id=%s, weight=%s", aircraft_id, weight)
+    
+    async def update_fuel(self, aircraft_id: str, weight: int) -> None:
         """
         Обновляет вес топлива
         
         Args:
             aircraft_id: ID самолета
             weight: Новый вес топлива в кг
-            
-        Returns:
-            Optional[AircraftInstance]: Обновленный инстанс самолета или None, если не найден
         """
-        logger.info(f"Запрос на обновление веса топлива: aircraft_id={aircraft_id}, weight={weight}")
-        
-        try:
-            # Получаем текущий инстанс
-            current = await self.get_by_id(aircraft_id)
-            logger.info(f"Текущий вес топлива: {current.actual_fuel_kg}/{current.fuel_capacity}")
-            
-            # Применяем обновление через метод модели
-            current.update_fuel(weight)
-            logger.info(f"Новый вес топлива: {current.actual_fuel_kg}/{current.fuel_capacity}")
-            
-            # Сохраняем обновленный инстанс
-            updated = await self.update(current)
-            logger.info(f"Вес топлива успешно обновлен: aircraft_id={aircraft_id}, weight={weight}")
-            return updated
-        except ValueError as e:
-            # Перехватываем ошибки валидации из модели
-            logger.error(f"Ошибка валидации при обновлении веса топлива: {str(e)}")
-            raise HTTPException(status_code=400, detail=str(e))
-        except HTTPException as e:
-            logger.error(f"HTTP ошибка при обновлении веса топлива: {e.status_code} - {e.detail}")
-            raise e
-        except Exception as e:
-            logger.error(f"Ошибка при обновлении веса топлива: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Ошибка при обновлении веса топлива: {str(e)}")
-        
-    async def update_node_id(self, aircraft_id: str, node_id: str) -> Optional[AircraftInstance]:
+        logger.debug("Запрос на обновление веса топлива: aircraft_id=%s, weight=%s", aircraft_id, weight)
+        await self._update_field(aircraft_id, "actual_fuel_kg", weight)
+        logger.info("Вес топлива успешно обновлен: aircraft_id=%s, weight=%s", aircraft_id, weight)
+    
+    async def update_node_id(self, aircraft_id: str, node_id: str) -> None:
         """
         Обновляет ID узла для инстанса самолета
         
         Args:
             aircraft_id: ID самолета
             node_id: ID узла
-            
-        Returns:
-            Optional[AircraftInstance]: Обновленный инстанс самолета или None, если не найден
         """
-        logger.info(f"Запрос на обновление ID узла: aircraft_id={aircraft_id}, node_id={node_id}")
-        
-        try:
-            # Получаем текущий инстанс
-            current = await self.get_by_id(aircraft_id)
-            logger.info(f"Текущий ID узла: {current.node_id}")
-            
-            # Применяем обновление через метод модели
-            current.update_node_id(node_id)
-            logger.info(f"Новый ID узла: {current.node_id}")
-            
-            # Сохраняем обновленный инстанс
-            updated = await self.update(current)
-            logger.info(f"ID узла успешно обновлен: aircraft_id={aircraft_id}, node_id={node_id}")
-            return updated
-        except HTTPException as e:
-            logger.error(f"HTTP ошибка при обновлении ID узла: {e.status_code} - {e.detail}")
-            raise e
-        except Exception as e:
-            logger.error(f"Ошибка при обновлении ID узла: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Ошибка при обновлении ID узла: {str(e)}")
\ No newline at end of file
+        logger.debug("Запрос на обновление ID узла: aircraft_id=%s, node_id=%s", aircraft_id, node_id)
+        await self._update_field(aircraft_id, "node_id", node_id)
+        logger.info("ID узла успешно обновлен: aircraft_id=%s, node_id=%s", aircraft_id, node_id)
@@ -0,0 +1,91 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from config.aircraft_config import AircraftConfig
+
+# config/__init__ реэкспортирует объект aircraft_config, перекрывающий одноименный модуль
+config_module = sys.modules["config.aircraft_config"]
+
+
+def _config(capacity: int) -> dict:
+    return {
+        "aircraft": [
+            {
+                "model": "Test 100",
+                "baggageCapacityKg": 1000,
+                "passengerCapacity": capacity,
+                "waterCapacity": 100,
+                "fuelCapacity": 5000,
+                "seats": [{"seatNumber": "1A", "seatClass": "economy"}],
+            }
+        ]
+    }
+
+
+class ConfigSnapshotTest(unittest.TestCase):
+    """Снимок разобранной конфигурации самолетов (AircraftConfig.from_config)"""
+    
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.config_path = os.path.join(tmp.name, "aircraft_config.json")
+        self.cache_path = os.path.join(tmp.name, "aircraft_config.cache.pkl")
+        self.write(_config(10))
+        
+        construct = mock.patch.object(AircraftConfig, "_construct", side_effect=AircraftConfig._construct)
+        self.construct = construct.start()
+        self.addCleanup(construct.stop)
+    
+    def write(self, data: dict) -> None:
+        with open(self.config_path, "w") as f:
+            json.dump(data, f)
+    
+    def load(self) -> AircraftConfig:
+        return AircraftConfig.from_config(self.config_path)
+    
+    def test_snapshot_is_reused(self):
+        self.load()
+        config = self.load()
+        
+        self.assertEqual(self.construct.call_count, 1)
+        self.assertEqual(config.aircraft["Test 100"].passenger_capacity, 10)
+    
+    def test_content_change_invalidates_snapshot(self):
+        self.load()
+        stat = os.stat(self.config_path)
+        self.write(_config(20))
+        # mtime не меняется: снимок привязан к содержимому файла
+        os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        
+        config = self.load()
+        
+        self.assertEqual(self.construct.call_count, 2)
+        self.assertEqual(config.aircraft["Test 100"].passenger_capacity, 20)
+    
+    def test_version_change_invalidates_snapshot(self):
+        self.load()
+        code_hash, _ = config_module._CACHE_VERSION
+        
+        with mock.patch.object(config_module, "_CACHE_VERSION", (code_hash, "0.0.0")):
+            self.load()
+        
+        self.assertEqual(self.construct.call_count, 2)
+    
+    def test_corrupt_snapshot_is_rebuilt(self):
+        with open(self.cache_path, "wb") as f:
+            f.write(b"garbage")
+        
+        config = self.load()
+        
+        self.assertEqual(self.construct.call_count, 1)
+        self.assertEqual(config.aircraft["Test 100"].passenger_capacity, 10)
+        # Снимок перезаписан целиком, временных файлов не осталось
+        self.assertEqual(sorted(os.listdir(os.path.dirname(self.cache_path))), ["aircraft_config.cache.pkl", "aircraft_config.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
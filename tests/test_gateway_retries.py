@@ -0,0 +1,106 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from aiohttp import web
+
+from gateways.base import BaseGateway, NonRetryableHTTPError, RetryableHTTPError
+
+
+class GatewayRetryTest(unittest.IsolatedAsyncioTestCase):
+    """Повторы запросов BaseGateway._make_request по типу ошибки"""
+    
+    async def asyncSetUp(self):
+        self.hits = 0
+        self.status = 200
+        # Обработчик зависает до завершения теста: asyncio.sleep подменен ниже
+        self.hang = False
+        self.release = asyncio.Event()
+        
+        async def handler(request):
+            self.hits += 1
+            if self.hang:
+                await self.release.wait()
+            return web.json_response({"ok": True}, status=self.status)
+        
+        app = web.Application()
+        app.router.add_route("*", "/resource", handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.gateway = BaseGateway(f"http://127.0.0.1:{port}", max_retries=3, retry_delay=1, max_retry_delay=3)
+        
+        # Паузы между попытками записываются, а не выдерживаются
+        self.sleep = mock.patch("gateways.base.asyncio.sleep", new=mock.AsyncMock())
+        self.delays = self.sleep.start()
+    
+    async def asyncTearDown(self):
+        self.sleep.stop()
+        self.release.set()
+        await BaseGateway.aclose()
+        await self.runner.cleanup()
+    
+    def slept(self):
+        return [call.args[0] for call in self.delays.await_args_list]
+    
+    async def test_success_is_returned(self):
+        self.assertEqual(await self.gateway.get("/resource"), {"ok": True})
+        self.assertEqual(self.hits, 1)
+    
+    async def test_client_error_is_not_retried(self):
+        self.status = 404
+        
+        with self.assertRaises(NonRetryableHTTPError) as error:
+            await self.gateway.post("/resource", data={"a": 1})
+        
+        self.assertEqual(error.exception.status, 404)
+        self.assertEqual(self.hits, 1)
+        self.assertEqual(self.slept(), [])
+    
+    async def test_server_error_is_retried_max_retries_times(self):
+        self.status = 503
+        
+        with self.assertRaises(RetryableHTTPError):
+            await self.gateway.get("/resource")
+        
+        self.assertEqual(self.hits, 4)
+        self.assertEqual(self.slept(), [1, 2, 3])
+    
+    async def test_too_many_requests_is_retried(self):
+        self.status = 429
+        
+        with self.assertRaises(RetryableHTTPError):
+            await self.gateway.get("/resource")
+        
+        self.assertEqual(self.hits, 4)
+    
+    async def test_timeout_is_retried_max_retries_times(self):
+        self.hang = True
+        
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.gateway.get("/resource", timeout=0.05)
+        
+        self.assertEqual(self.hits, 4)
+        self.assertEqual(len(self.slept()), 3)
+
+
+class RetryDelaysTest(unittest.TestCase):
+    """Таблица задержек между попытками (BaseGateway._delays)"""
+    
+    def test_delays_grow_up_to_the_limit(self):
+        gateway = BaseGateway("http://service", max_retries=5, retry_delay=1, retry_multiplier=2.0, max_retry_delay=5)
+        self.assertEqual(gateway._delays, (1, 2, 4, 5))
+    
+    def test_delays_are_bounded_by_max_retries(self):
+        gateway = BaseGateway("http://service", max_retries=2, retry_delay=1, retry_multiplier=2.0, max_retry_delay=60)
+        self.assertEqual(gateway._delays, (1, 2))
+    
+    def test_infinite_retries_stop_growing_at_the_limit(self):
+        gateway = BaseGateway("http://service", max_retries=0, retry_delay=1, retry_multiplier=3.0, max_retry_delay=10)
+        self.assertEqual(gateway._delays, (1, 3, 9, 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
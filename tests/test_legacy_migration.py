@@ -0,0 +1,93 @@
+import json
+import unittest
+from unittest import mock
+
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import ConnectionError
+
+from services.aircraft_service import AircraftService
+
+
+_RECORD = {
+    "id": "A1",
+    "model": "Boeing 737-800",
+    "flight_id": "F1",
+    "node_id": "N1",
+    "baggage_capacity_kg": 100,
+    "passenger_capacity": 10,
+    "water_capacity": 5,
+    "fuel_capacity": 50,
+    "actual_passengers": 3,
+}
+
+
+class LegacyMigrationTest(unittest.IsolatedAsyncioTestCase):
+    """Перенос ключей прежней раскладки (migrate_legacy_keys)"""
+    
+    async def asyncSetUp(self):
+        self.redis = FakeRedis(server=FakeServer(), decode_responses=True)
+        self.service = AircraftService(self.redis)
+        await self.redis.set("flight:F1", json.dumps(_RECORD))
+        await self.redis.set("aircraft_to_flight:A1", "F1")
+        await self.redis.sadd("flights:all", "F1")
+    
+    async def asyncTearDown(self):
+        await self.redis.aclose()
+    
+    async def test_records_and_mappings_are_moved(self):
+        await self.service.migrate_legacy_keys()
+        
+        self.assertEqual(sorted(await self.redis.keys("*")), ["a2f", "f:F1", "layout"])
+        self.assertEqual(await self.service.get_field("A1", "actual_passengers"), 3)
+        self.assertEqual((await self.service.get_by_flight_id("F1")).node_id, "N1")
+    
+    async def test_existing_mapping_is_kept(self):
+        await self.redis.hset("a2f", "A1", "F9")
+        
+        await self.service.migrate_legacy_keys()
+        
+        self.assertEqual(await self.redis.hget("a2f", "A1"), "F9")
+        self.assertFalse(await self.redis.exists("aircraft_to_flight:A1"))
+    
+    async def test_unparseable_record_stays(self):
+        await self.redis.set("flight:F2", "garbage")
+        
+        await self.service.migrate_legacy_keys()
+        
+        self.assertEqual(await self.redis.get("flight:F2"), "garbage")
+        self.assertTrue(await self.redis.exists("f:F1"))
+    
+    async def test_failed_write_keeps_legacy_keys(self):
+        execute = Pipeline.execute
+        
+        async def failing_execute(pipe, *args, **kwargs):
+            # Обрыв соединения на пайплайне переноса; чтение проходит
+            if pipe.scripts:
+                raise ConnectionError("connection lost")
+            return await execute(pipe, *args, **kwargs)
+        
+        with mock.patch.object(Pipeline, "execute", failing_execute):
+            await self.service.migrate_legacy_keys()
+        
+        self.assertEqual(
+            sorted(await self.redis.keys("*")),
+            ["aircraft_to_flight:A1", "flight:F1", "flights:all"],
+        )
+        
+        # Следующий запуск переносит записи
+        await self.service.migrate_legacy_keys()
+        self.assertEqual(await self.service.get_field("A1", "node_id"), "N1")
+    
+    async def test_later_starts_skip_the_scan(self):
+        await self.service.migrate_legacy_keys()
+        
+        with mock.patch.object(self.redis, "scan_iter") as scan_iter:
+            await self.service.migrate_legacy_keys()
+        
+        scan_iter.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
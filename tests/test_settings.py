@@ -0,0 +1,68 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+from config.settings import Settings, _coerce, load_settings
+
+# config/__init__ реэкспортирует объект settings, перекрывающий одноименный модуль
+settings_module = sys.modules["config.settings"]
+
+
+class CoerceTest(unittest.TestCase):
+    """Приведение строк из окружения к типам полей настроек (_coerce)"""
+    
+    def test_bool(self):
+        for value in ("1", "true", "True", " yes ", "on"):
+            self.assertIs(_coerce(bool, value), True, value)
+        for value in ("0", "false", "no", "off", ""):
+            self.assertIs(_coerce(bool, value), False, value)
+    
+    def test_int(self):
+        self.assertEqual(_coerce(int, "42"), 42)
+        with self.assertRaises(ValueError):
+            _coerce(int, "many")
+    
+    def test_str_is_kept(self):
+        self.assertEqual(_coerce(str, "redis://cache:6379"), "redis://cache:6379")
+
+
+class LoadSettingsTest(unittest.TestCase):
+    """Сборка настроек из .env и окружения (load_settings)"""
+    
+    def load(self, env_file: dict, environ: dict) -> Settings:
+        with mock.patch.object(settings_module, "_load_env_dict", return_value=env_file), \
+                mock.patch.dict(os.environ, environ, clear=True):
+            return load_settings()
+    
+    def test_values_are_coerced(self):
+        settings = self.load(
+            {"REDIS_MAX_CONNECTIONS": "8", "AIRCRAFT_CONFIG_VALIDATE": "true"},
+            {"LOG_LEVEL": "warning"},
+        )
+        
+        self.assertEqual(settings.REDIS_MAX_CONNECTIONS, 8)
+        self.assertIs(settings.AIRCRAFT_CONFIG_VALIDATE, True)
+        self.assertEqual(settings.LOG_LEVEL, "warning")
+    
+    def test_environment_overrides_env_file(self):
+        settings = self.load({"REDIS_MAX_CONNECTIONS": "8"}, {"REDIS_MAX_CONNECTIONS": "16"})
+        self.assertEqual(settings.REDIS_MAX_CONNECTIONS, 16)
+    
+    def test_defaults_are_kept(self):
+        settings = self.load({}, {})
+        self.assertEqual(settings.REDIS_URL, "redis://localhost:6379")
+        self.assertIs(settings.AIRCRAFT_CONFIG_VALIDATE, False)
+    
+    def test_validation_mode_matches(self):
+        environ = {"SETTINGS_VALIDATE": "1", "REDIS_MAX_CONNECTIONS": "16", "AIRCRAFT_CONFIG_VALIDATE": "true"}
+        # Settings() читает .env из текущего каталога; файл подменяется несуществующим
+        with mock.patch.dict(Settings.model_config, {"env_file": "missing.env"}):
+            validated = self.load({}, environ)
+        constructed = self.load({}, {k: v for k, v in environ.items() if k != "SETTINGS_VALIDATE"})
+        
+        self.assertEqual(validated.model_dump(), constructed.model_dump())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+from redis.asyncio.client import Pipeline
+
+from services.aircraft_service import AircraftNotFound, AircraftService, ValidationFailed
+
+
+class UpdateBatchingTest(unittest.IsolatedAsyncioTestCase):
+    """Пакетирование обновлений полей (_batched_update)"""
+    
+    async def asyncSetUp(self):
+        self.redis = FakeRedis(server=FakeServer(), decode_responses=True)
+        self.service = AircraftService(self.redis)
+        self.aircraft_ids = [f"A{i}" for i in range(4)]
+        for i, aircraft_id in enumerate(self.aircraft_ids):
+            await self.service.generate_random(f"F{i}", "Boeing 737-800")
+            await self.service.set_aircraft_id(f"F{i}", aircraft_id)
+        
+        # Считаем пайплайны и проверки SCRIPT EXISTS, которые redis-py делает перед пайплайном со скриптами
+        self.pipelines = mock.patch.object(Pipeline, "execute", autospec=True, side_effect=Pipeline.execute)
+        self.script_exists = mock.patch.object(Pipeline, "load_scripts", autospec=True, side_effect=Pipeline.load_scripts)
+        self.execute_spy = self.pipelines.start()
+        self.load_scripts_spy = self.script_exists.start()
+        self.addCleanup(mock.patch.stopall)
+        
+        # fakeredis отвечает без переключения задач; задержка имитирует ожидание
+        # ответа Redis, за время которого конкурентные обновления встают в очередь
+        script = self.service._update_field_script
+        
+        async def slow_script(**kwargs):
+            await asyncio.sleep(0)
+            return await script(**kwargs)
+        
+        slow_script.sha = script.sha
+        self.service._update_field_script = slow_script
+    
+    async def asyncTearDown(self):
+        await self.redis.aclose()
+    
+    async def passengers(self, aircraft_id: str) -> int:
+        return await self.service.get_field(aircraft_id, "actual_passengers")
+    
+    async def test_single_update_runs_script_directly(self):
+        await self.service.update_passengers("A0", 10)
+        
+        self.assertEqual(self.execute_spy.call_count, 0)
+        self.assertEqual(self.load_scripts_spy.call_count, 0)
+        self.assertEqual(await self.passengers("A0"), 10)
+    
+    async def test_concurrent_updates_share_one_pipeline(self):
+        await asyncio.gather(*(
+            self.service.update_passengers(aircraft_id, 20 + i)
+            for i, aircraft_id in enumerate(self.aircraft_ids)
+        ))
+        
+        # Первое обновление уходит сразу, остальные - одним пайплайном без SCRIPT EXISTS
+        self.assertEqual(self.execute_spy.call_count, 1)
+        self.assertEqual(self.load_scripts_spy.call_count, 0)
+        for i, aircraft_id in enumerate(self.aircraft_ids):
+            self.assertEqual(await self.passengers(aircraft_id), 20 + i)
+    
+    async def test_errors_reach_only_their_callers(self):
+        results = await asyncio.gather(
+            self.service.update_passengers("A0", 1),
+            self.service.update_passengers("A1", 2),
+            self.service.update_passengers("A2", 1_000_000),
+            self.service.update_passengers("ZZ", 3),
+            self.service.update_passengers("A3", 4),
+            return_exceptions=True,
+        )
+        
+        self.assertIsNone(results[0])
+        self.assertIsNone(results[1])
+        self.assertIsInstance(results[2], ValidationFailed)
+        self.assertIsInstance(results[3], AircraftNotFound)
+        self.assertIsNone(results[4])
+        self.assertEqual(await self.passengers("A1"), 2)
+        self.assertEqual(await self.passengers("A3"), 4)
+    
+    async def test_batch_reloads_flushed_script(self):
+        # Пока выполняется другое обновление, вызовы встают в очередь
+        self.service._update_in_flight = True
+        updates = [
+            asyncio.create_task(self.service.update_passengers(aircraft_id, 30))
+            for aircraft_id in self.aircraft_ids
+        ]
+        await asyncio.sleep(0)
+        self.assertEqual(len(self.service._pending_updates), len(self.aircraft_ids))
+        
+        # Скрипт выгружен из Redis: EVALSHA в пайплайне вернет NOSCRIPT
+        await self.redis.script_flush()
+        await self.service._flush_updates()
+        await asyncio.gather(*updates)
+        
+        self.assertFalse(self.service._update_in_flight)
+        for aircraft_id in self.aircraft_ids:
+            self.assertEqual(await self.passengers(aircraft_id), 30)
+
+
+if __name__ == "__main__":
+    unittest.main()